@@ -9,11 +9,16 @@ FILE AS A BLACK BOX FOR TESTING.
 """
 import random
 import unittest
-import timeit
+import os
 import sys
+import tempfile
+import time
+import timeit
 
 import isolation
+import competition_agent
 import game_agent
+import sample_players
 
 from collections import Counter
 from copy import deepcopy
@@ -549,6 +554,607 @@ class IsolationTest(unittest.TestCase):
         self.player2 = "Player2"
         self.game = isolation.Board(self.player1, self.player2)
 
+    def test_move_table(self):
+        """ Test the shared knight move table against the board geometry """
+        table = isolation.Board(self.player1, self.player2, 5, 4).move_table
+        self.assertIs(table, isolation.Board('a', 'b', 5, 4).move_table)
+        corner = table.coords.index((0, 0))
+        self.assertEqual([(1, 2), (2, 1)],
+                         sorted(table.coords[i] for i in table.knight_cells[corner]))
+        self.assertEqual(sum(1 << i for i in table.knight_cells[corner]),
+                         table.knight_masks[corner])
+
+    def test_move_order_modes(self):
+        """ Test seeded and shuffle-free legal move generation """
+        orders = []
+        for kwargs in ({'seed': 7}, {'seed': 7}, {'shuffle': False}):
+            game = isolation.Board(self.player1, self.player2, **kwargs)
+            game.apply_move((3, 3))
+            game.apply_move((0, 0))
+            orders.append([game.copy().get_legal_moves() for _ in range(5)])
+            self.assertEqual(len(orders[-1][0]), game.count_legal_moves())
+            self.assertEqual(2, game.count_legal_moves(self.player2))
+        self.assertEqual(orders[0], orders[1])
+        self.assertEqual(1, len(set(map(tuple, orders[2]))))
+
+    def test_move_cache(self):
+        """ Test that cached move lists follow the position """
+        self.game.apply_move((3, 3))
+        self.game.apply_move((0, 0))
+        moves = self.game.get_legal_moves()
+        moves.pop()
+        self.assertEqual(8, len(self.game.get_legal_moves()))
+
+        self.game.push_move((1, 2))
+        self.assertEqual([(2, 1)], self.game.get_legal_moves())
+        self.game.push_move((2, 1))
+        self.assertEqual(4, len(self.game.get_legal_moves()))
+        self.game.pop_move()
+        self.assertEqual([(2, 1)], self.game.get_legal_moves())
+        self.game.pop_move()
+        self.assertEqual(8, self.game.count_legal_moves())
+        self.assertFalse(self.game.is_loser(self.player1))
+
+    def test_play_telemetry(self):
+        """ Test that Board.play() records one entry per move solicited """
+        agentUT = game_agent.CustomPlayer(2, game_agent.custom_score, False,
+                                          'alphabeta')
+        opponent = sample_players.RandomPlayer()
+        game = isolation.Board(agentUT, opponent, 5, 5)
+        game.apply_move((2, 2))
+        game.apply_move((0, 0))
+
+        records = []
+        winner, history, _ = game.play(telemetry=records)
+
+        self.assertEqual(sum(map(len, history)), len(records))
+        self.assertEqual([r.player for r in records],
+                         [(agentUT, opponent)[i % 2] for i in range(len(records))])
+        for record in records:
+            self.assertLessEqual(0, record.time_used)
+            if record.player is agentUT:
+                expected_depth = 2 if record.legal_moves else 0
+                self.assertEqual(expected_depth, record.stats['depth'])
+                self.assertIn('nodes', record.stats)
+            else:
+                self.assertEqual({}, record.stats)
+
+    def test_play_watchdog(self):
+        """ Test that a watchdog forfeits an agent that ignores the timer """
+
+        # The stall is long enough to be forfeited but finite, so that the
+        # thread the 'thread' watchdog cannot stop still ends
+        class StalledPlayer():
+            def get_move(self, game, legal_moves, time_left):
+                time.sleep(1)
+                return (-1, -1)
+
+        for watchdog in ('thread', 'process'):
+            stalled = StalledPlayer()
+            game = isolation.Board(stalled, sample_players.RandomPlayer())
+            start = curr_time_millis()
+            winner, _, termination = game.play(time_limit=20, watchdog=watchdog,
+                                               grace=20)
+            self.assertLess(curr_time_millis() - start, 1000)
+            self.assertIsNot(stalled, winner)
+            self.assertEqual("timeout", termination)
+
+        # A watchdog process that dies without answering also forfeits
+        class CrashingPlayer():
+            def get_move(self, game, legal_moves, time_left):
+                os._exit(1)
+
+        crashing = CrashingPlayer()
+        game = isolation.Board(crashing, sample_players.RandomPlayer())
+        winner, _, termination = game.play(time_limit=20, watchdog='process')
+        self.assertIsNot(crashing, winner)
+        self.assertEqual("illegal move", termination)
+
+    def test_game_records(self):
+        """ Test that game records survive a round trip through an archive """
+        game = isolation.Board(sample_players.RandomPlayer(),
+                               sample_players.RandomPlayer(), 5, 5)
+        winner, history, termination = game.play()
+        moves = [move for pair in history for move in pair]
+        record = isolation.GameRecord(5, 5, ('p1', 'p2'),
+                                      0 if winner is game.__player_1__ else 1,
+                                      termination, 150, 12.5, moves)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'games.bin')
+            for _ in range(2):
+                with isolation.GameRecordWriter(path) as writer:
+                    writer.write(record)
+            with isolation.GameRecordReader(path) as reader:
+                records = list(reader)
+
+        self.assertEqual([record, record], records)
+        self.assertEqual((-1, -1), records[0].moves[-1])
+
+        # Long names are truncated to 255 bytes on a character boundary
+        long_record = record._replace(players=('\xe9' * 200, 'p2'))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'games.bin')
+            with isolation.GameRecordWriter(path) as writer:
+                writer.write(long_record)
+                writer.write(record)
+            with isolation.GameRecordReader(path) as reader:
+                records = list(reader)
+
+        self.assertEqual(('\xe9' * 127, 'p2'), records[0].players)
+        self.assertEqual(record, records[1])
+
+    def test_transposition_table(self):
+        """ Test the two-tier replacement scheme of the transposition table """
+        table = game_agent.TranspositionTable(1e-3)
+        key, other = 5, 5 + table.buckets
+        table.store(key, 4, 1., game_agent.EXACT, (0, 0))
+        table.store(other, 2, 2., game_agent.LOWER, (1, 1))
+        self.assertEqual(4, table.probe(key)[1])
+        self.assertEqual(2, table.probe(other)[1])
+        table.store(other + table.buckets, 1, 3., game_agent.UPPER, (2, 2))
+        self.assertIsNone(table.probe(other))
+        self.assertEqual(4, table.probe(key)[1])
+        table.store(other, 6, 2., game_agent.EXACT, (1, 1))
+        self.assertIsNone(table.probe(key))
+
+    def test_transposition_search(self):
+        """ Test that alphabeta returns the same value with a table """
+        for loc1, loc2 in [((2, 3), (0, 5)), ((3, 3), (4, 4)), ((0, 0), (6, 6))]:
+            scores = []
+            for megabytes in (0, 1):
+                agentUT = game_agent.CustomPlayer(
+                    4, sample_players.improved_score, False, 'alphabeta',
+                    tt_megabytes=megabytes)
+                agentUT.time_left = lambda: 1e3
+                board = isolation.Board(agentUT, self.player2)
+                board.apply_move(loc1)
+                board.apply_move(loc2)
+                scores.append(agentUT.alphabeta(board, 4)[0])
+            self.assertEqual(scores[0], scores[1])
+
+    def test_move_ordering(self):
+        """ Test move ordering by best move, killers and history """
+        agentUT = game_agent.CustomPlayer(ordering=True)
+        agentUT.record_cutoff((1, 1), 3, 2, 3, True)
+        agentUT.record_cutoff((2, 2), 0, 2, 1, True)
+        agentUT.record_cutoff((3, 3), 4, 5, 4, True)
+        moves = [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]
+        agentUT.order_moves(moves, (4, 4), 2, True)
+        self.assertEqual([(4, 4), (2, 2), (1, 1), (3, 3), (0, 0)], moves)
+        self.assertEqual(1. / 3, agentUT.search_stats.first_cutoff_rate())
+
+        # Ordering changes how much is pruned, but not the search result
+        scores = []
+        for ordering in (False, True):
+            agentUT = game_agent.CustomPlayer(
+                5, sample_players.improved_score, False, 'alphabeta',
+                ordering=ordering)
+            agentUT.time_left = lambda: 1e3
+            board = isolation.Board(agentUT, self.player2)
+            board.apply_move((2, 3))
+            board.apply_move((0, 5))
+            scores.append(agentUT.alphabeta(board, 5)[0])
+        self.assertEqual(scores[0], scores[1])
+
+    def test_search_stats(self):
+        """ Test the search statistics recorded by get_move """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta')
+        board = isolation.Board(agentUT, self.player2)
+        board.apply_move((2, 3))
+        board.apply_move((0, 5))
+        time_left = lambda: 1e3 if agentUT.search_stats.depth < 3 else 0.
+        agentUT.get_move(board, board.get_legal_moves(), time_left)
+
+        stats = agentUT.search_stats.as_dict()
+        self.assertEqual(3, stats['depth'])
+        self.assertEqual([1, 2, 3], [it[0] for it in stats['iterations']])
+        self.assertEqual(stats['nodes'], sum(it[1] for it in stats['iterations']))
+        self.assertLess(0, stats['leaves'])
+        self.assertLess(stats['leaves'], stats['nodes'])
+        self.assertEqual(stats['cutoffs'], sum(stats['cutoffs_by_child']))
+        nodes = [it[1] for it in stats['iterations']]
+        self.assertEqual(nodes[2] / nodes[1], stats['ebf'])
+        self.assertLess(0, stats['nps'])
+
+        # A new search starts from fresh statistics
+        agentUT.get_move(board, [], time_left)
+        self.assertEqual(0, agentUT.search_stats.nodes)
+
+    def test_predictive_deepening(self):
+        """ Test that predictive time management stops deepening by itself """
+        agentUT = game_agent.CustomPlayer(predictive=True)
+        agentUT.search_stats.iterations = [(1, 10, 1.), (2, 40, 2.), (3, 90, 4.)]
+        self.assertAlmostEqual(4. * 3 * game_agent.PREDICTION_MARGIN,
+                               agentUT.predict_iteration())
+
+        # With unlimited time, deepening ends once the score is proven or the
+        # search reaches the end of the game
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', predictive=True)
+        board = isolation.Board(agentUT, self.player2, 4, 4)
+        board.apply_move((0, 0))
+        board.apply_move((3, 3))
+        move = agentUT.get_move(board, board.get_legal_moves(), lambda: 1e3)
+        self.assertIn(move, board.get_legal_moves())
+        self.assertLessEqual(agentUT.search_stats.depth, 14)
+
+    def test_pondering(self):
+        """ Test that pondering searches the opponent's replies """
+        agentUT = game_agent.CustomPlayer(3, sample_players.improved_score,
+                                          False, 'alphabeta', tt_megabytes=1,
+                                          ponder=True)
+        self.addCleanup(agentUT.close)
+        board = isolation.Board(agentUT, self.player2, 5, 5)
+        board.apply_move((2, 2))
+        board.apply_move((0, 0))
+        move = agentUT.get_move(board, board.get_legal_moves(), lambda: 50.)
+        stats = agentUT.search_stats
+        time.sleep(0.02)
+
+        board.apply_move(move)
+        keys = [board.forecast_move(reply).hash_key()
+                for reply in board.get_legal_moves()]
+        results = agentUT.stop_pondering()
+        self.assertFalse(agentUT._pondering)
+        self.assertIs(stats, agentUT.search_stats)
+        self.assertTrue(results)
+        self.assertLessEqual(set(results), set(keys))
+        for key, (depth, score, best) in results.items():
+            self.assertLessEqual(1, depth)
+            self.assertEqual(best, agentUT.tt.probe(key)[4])
+
+        process = agentUT._ponderer[0]
+        agentUT.close()
+        self.assertFalse(process.is_alive())
+        self.assertIsNone(agentUT._ponderer)
+
+    def test_parallel_search(self):
+        """ Test that a root-split search over several processes merges the
+        results of its workers into a legal move """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', workers=2)
+        board = isolation.Board(agentUT, self.player2)
+        board.apply_move((3, 3))
+        board.apply_move((2, 4))
+        time_limit = 100
+        start = curr_time_millis()
+        time_left = lambda: time_limit - (curr_time_millis() - start)
+        move = agentUT.get_move(board, board.get_legal_moves(), time_left)
+
+        self.assertIn(move, board.get_legal_moves())
+        stats = agentUT.search_stats
+        self.assertEqual(2, stats.workers)
+        self.assertLessEqual(1, stats.depth)
+        self.assertEqual(list(range(1, stats.depth + 1)),
+                         [it[0] for it in stats.iterations])
+
+    def test_separated_endgame(self):
+        """ Test the separated endgame solver against a full-depth search """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', endgame=True)
+        agentUT.time_left = lambda: 1e3
+        rng = random.Random(2)
+        checked = 0
+        while checked < 10:
+            # Give each position the solver budget of a new move
+            agentUT._endgame_limit = (len(agentUT._endgame_memo) +
+                                      game_agent.ENDGAME_BUDGET)
+            board = isolation.Board(agentUT, self.player2, 5, 5)
+            while board.get_legal_moves():
+                board.apply_move(rng.choice(board.get_legal_moves()))
+                if (board.move_count > 2 and board.get_legal_moves() and
+                        agentUT.solve_endgame(board) is not None):
+                    break
+            else:
+                continue
+            score, move = agentUT.solve_endgame(board)
+            self.assertIn(move, board.get_legal_moves())
+
+            agentUT.endgame = False
+            maximise = board.active_player is agentUT
+            self.assertEqual(agentUT.alphabeta(board, 25, maximizing_player=maximise)[0],
+                             score)
+            agentUT.endgame = True
+            checked += 1
+
+        # The solver gives up at the time limit
+        agentUT._endgame_memo.clear()
+        agentUT.time_left = lambda: 0
+        self.assertIsNone(agentUT.solve_endgame(board))
+        agentUT.time_left = lambda: 1e3
+        self.assertEqual(score, agentUT.solve_endgame(board)[0])
+
+    def test_search_reuse(self):
+        """ Test that iterative deepening resumes two plies short of the last
+        search after the opponent's reply """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', ordering=True,
+                                          predictive=True, reuse=True)
+        board = isolation.Board(agentUT, self.player2)
+        board.apply_move((3, 3))
+        board.apply_move((2, 4))
+        time_limit = 200
+        for _ in range(2):
+            start = curr_time_millis()
+            time_left = lambda: time_limit - (curr_time_millis() - start)
+            move = agentUT.get_move(board, board.get_legal_moves(), time_left)
+            self.assertIn(move, board.get_legal_moves())
+            depth = agentUT.search_stats.depth
+            board.apply_move(move)
+            board.apply_move(board.get_legal_moves()[0])
+
+        start = curr_time_millis()
+        agentUT.get_move(board, board.get_legal_moves(), time_left)
+        self.assertEqual(max(1, depth - 2), agentUT.search_stats.iterations[0][0])
+
+        # A position not reached from the last one starts from scratch
+        board = isolation.Board(agentUT, self.player2)
+        start = curr_time_millis()
+        agentUT.get_move(board, board.get_legal_moves(), time_left)
+        self.assertEqual(1, agentUT.search_stats.iterations[0][0])
+
+    def test_reuse_seat_swap(self):
+        """ Test that a search agrees with a fresh agent's after the agent
+        changes seats, when it keeps its transposition table between moves """
+        agentUT = game_agent.CustomPlayer(3, sample_players.improved_score,
+                                          False, 'alphabeta', reuse=True)
+        time_left = lambda: 1e3
+        rng = random.Random(3)
+        for _ in range(10):
+            opening = []
+            board = isolation.Board(agentUT, self.player2, shuffle=False)
+            while len(opening) < 3:
+                opening.append(rng.choice(board.get_legal_moves()))
+                board.apply_move(opening[-1])
+
+            # Play the position before the opponent's last move as player
+            # 1, then the position after it as player 2
+            scores = []
+            for agent in (agentUT, game_agent.CustomPlayer(
+                    3, sample_players.improved_score, False, 'alphabeta',
+                    reuse=True)):
+                if agent is agentUT:
+                    # One ply deeper, so that its entries are deep enough to
+                    # be used by the next search
+                    board = isolation.Board(agentUT, self.player2, shuffle=False)
+                    for move in opening[:2]:
+                        board.apply_move(move)
+                    agentUT.search_depth = 4
+                    agentUT.get_move(board, board.get_legal_moves(), time_left)
+                    agentUT.search_depth = 3
+                board = isolation.Board(self.player2, agent, shuffle=False)
+                for move in opening:
+                    board.apply_move(move)
+                agent.get_move(board, board.get_legal_moves(), time_left)
+                scores.append(agent.tt.probe(board.hash_key())[2])
+            self.assertEqual(scores[1], scores[0])
+
+    def test_adaptive_clock(self):
+        """ Test that the search reads the clock less often than once per
+        node, and still stops before the deadline """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', adaptive_clock=True)
+        board = isolation.Board(agentUT, self.player2)
+        board.apply_move((3, 3))
+        board.apply_move((2, 4))
+        time_limit, calls = 100, []
+        start = curr_time_millis()
+
+        def time_left():
+            calls.append(None)
+            return time_limit - (curr_time_millis() - start)
+
+        agentUT.time_left = time_left
+        with self.assertRaises(game_agent.Timeout):
+            agentUT.alphabeta(board, 40)
+        self.assertLess(0, time_left())
+        self.assertLess(10 * len(calls), agentUT.search_stats.nodes)
+
+    def test_selective_depth(self):
+        """ Test that late move reductions shrink a fixed-depth search, and
+        that the moves of a forced position are searched one ply deeper """
+        nodes = []
+        for reductions in (False, True):
+            agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                              method='alphabeta', ordering=True,
+                                              reductions=reductions)
+            agentUT.time_left = lambda: 1e3
+            board = isolation.Board(agentUT, self.player2, shuffle=False)
+            board.apply_move((2, 3))
+            board.apply_move((0, 5))
+            _, move = agentUT.alphabeta(board, 6)
+            self.assertIn(move, board.get_legal_moves())
+            nodes.append(agentUT.search_stats.nodes)
+        self.assertLess(nodes[1], nodes[0])
+
+        # Player 1 has two moves from the corner, so a one-ply search also
+        # scores player 2's seven replies to each of them
+        for extensions, leaves in [(False, 2), (True, 14)]:
+            agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                              extensions=extensions)
+            agentUT.time_left = lambda: 1e3
+            board = isolation.Board(agentUT, self.player2)
+            board.apply_move((0, 0))
+            board.apply_move((3, 3))
+            agentUT.minimax(board, 1)
+            self.assertEqual(leaves, agentUT.search_stats.leaves)
+
+    def test_proof_number_search(self):
+        """ Test proof-number search against a full-depth search, and that
+        get_move() plays cached proofs without searching """
+        agentUT = game_agent.CustomPlayer(score_fn=sample_players.improved_score,
+                                          method='alphabeta', proof_cells=25)
+        agentUT.time_left = lambda: 1e3
+        rng = random.Random(3)
+        for _ in range(10):
+            board = isolation.Board(agentUT, self.player2, 5, 5)
+            for _ in range(rng.randrange(2, 8)):
+                if not board.get_legal_moves():
+                    break
+                board.apply_move(rng.choice(board.get_legal_moves()))
+            if not board.get_legal_moves():
+                continue
+            score, move = agentUT.prove(board, 1e3)
+            self.assertIn(move, board.get_legal_moves())
+            self.assertEqual((score, move), agentUT.proven(board))
+
+            agentUT.proof_cells = 0
+            maximise = board.active_player is agentUT
+            self.assertEqual(agentUT.alphabeta(board, 25, maximizing_player=maximise)[0],
+                             score)
+            agentUT.proof_cells = 25
+
+        board = isolation.Board(agentUT, self.player2, 5, 5)
+        board.apply_move((2, 2))
+        board.apply_move((0, 0))
+        score, move = agentUT.prove(board, 1e3)
+        self.assertEqual(move, agentUT.get_move(board, board.get_legal_moves(),
+                                                lambda: 1e3))
+        self.assertEqual(0, agentUT.search_stats.nodes)
+
+    def test_opening_book(self):
+        """ Test that book moves follow the board through its symmetries """
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        'my-board'))
+        from opening_book import OpeningBook
+
+        book = OpeningBook(plies=2)
+        agentUT = game_agent.CustomPlayer(book=book)
+        board = isolation.Board(self.player1, agentUT)
+        board.apply_move((0, 1))
+        book.add(board, (2, 2))
+
+        # The same position rotated 180 degrees and reflected in the diagonal
+        for first, reply in [((6, 5), (4, 4)), ((1, 0), (2, 2))]:
+            board = isolation.Board(self.player1, agentUT)
+            board.apply_move(first)
+            self.assertEqual(reply, book.lookup(board))
+            self.assertEqual(reply, agentUT.get_move(board, board.get_legal_moves(),
+                                                     lambda: 1e3))
+            self.assertEqual(0, agentUT.search_stats.nodes)
+
+        board.apply_move((2, 2))
+        self.assertIsNone(book.lookup(board))
+
+    def test_mcts(self):
+        """ Test the MCTS agent, and that it reuses its tree between moves """
+        for rollout in ('random', 'greedy'):
+            agentUT = competition_agent.CustomPlayer(rollout=rollout)
+            board = isolation.Board(agentUT, self.player2, 5, 5)
+            board.apply_move((2, 2))
+            board.apply_move((0, 0))
+
+            time_limit = 50
+            start = curr_time_millis()
+            time_left = lambda: time_limit - (curr_time_millis() - start)
+            move = agentUT.get_move(board, time_left)
+            self.assertIn(move, board.get_legal_moves())
+
+            # Reply with the move the search expects, which it has expanded
+            board.apply_move(move)
+            reply = max(agentUT._root.children, key=lambda child: child.visits)
+            board.apply_move(reply.move)
+            visits = reply.visits
+            start = curr_time_millis()
+            move = agentUT.get_move(board, board.get_legal_moves(), time_left)
+            self.assertIn(move, board.get_legal_moves())
+            self.assertEqual(visits, agentUT.search_stats['reused_visits'])
+            self.assertLess(0, visits)
+
+        # With no time for a single playout, a legal move is still played
+        agentUT = competition_agent.CustomPlayer()
+        board = isolation.Board(agentUT, self.player2, 5, 5)
+        move = agentUT.get_move(board, lambda: 0)
+        self.assertIn(move, board.get_legal_moves())
+        with self.assertRaises(TypeError):
+            agentUT.get_move(board, board.get_legal_moves())
+
+        # Every move of a full game is legal, until a player has none left
+        agentUT = competition_agent.CustomPlayer()
+        board = isolation.Board(agentUT, sample_players.RandomPlayer())
+        _, history, _ = board.play(time_limit=150)
+        game = isolation.Board(agentUT, board.__player_2__)
+        for move in sum(history, []):
+            if not game.get_legal_moves():
+                break
+            self.assertIn(move, game.get_legal_moves())
+            game.apply_move(move)
+
+    def test_pvs(self):
+        """ Test that PVS, aspiration windows and MTD(f) agree with alphabeta """
+        for loc1, loc2 in [((2, 3), (0, 5)), ((3, 3), (4, 4)), ((0, 0), (6, 6))]:
+            scores = []
+            for method in ('alphabeta', 'pvs', 'aspiration', 'mtdf'):
+                agentUT = game_agent.CustomPlayer(
+                    5, sample_players.center_score, False,
+                    'pvs' if method == 'aspiration' else method,
+                    aspiration=0.5)
+                agentUT.time_left = lambda: 1e3
+                board = isolation.Board(agentUT, self.player2)
+                board.apply_move(loc1)
+                board.apply_move(loc2)
+                if method == 'aspiration':
+                    scores.append(agentUT.aspiration_search(board, 5, 20.)[0])
+                else:
+                    scores.append(agentUT.fn(board, 5)[0])
+            self.assertEqual([scores[0]] * 4, scores)
+
+    def test_push_pop_move(self):
+        """ Test that pop_move restores the position before push_move """
+        self.game.apply_move((2, 3))
+        self.game.apply_move((0, 5))
+        before = self.game.to_string()
+        moves = self.game.get_legal_moves()
+
+        self.game.push_move(moves[0])
+        self.game.push_move(self.game.get_legal_moves()[0])
+        self.assertNotEqual(before, self.game.to_string())
+        self.game.pop_move()
+        self.game.pop_move()
+
+        self.assertEqual(before, self.game.to_string())
+        self.assertEqual(self.player1, self.game.active_player)
+        self.assertEqual(2, self.game.move_count)
+        self.assertEqual(sorted(moves), sorted(self.game.get_legal_moves()))
+
+    def test_hash_key(self):
+        """ Test that the incremental hash key tracks the position """
+        self.game.apply_move((2, 3))
+        self.game.apply_move((0, 5))
+        key = self.game.hash_key()
+        self.game.push_move((0, 2))
+        self.assertNotEqual(key, self.game.hash_key())
+        self.game.pop_move()
+        self.assertEqual(key, self.game.hash_key())
+
+        # Rebuilding the same position through the legacy attributes (as
+        # CounterBoard.copy does) recomputes an identical key
+        for move in [(1, 1), (2, 4), (0, 3)]:
+            self.game.apply_move(move)
+        rebuilt = isolation.Board(self.player1, self.player2)
+        rebuilt.__active_player__ = self.game.__active_player__
+        rebuilt.__last_player_move__ = self.game.__last_player_move__
+        rebuilt.__board_state__ = self.game.__board_state__
+        self.assertEqual(self.game.hash_key(), rebuilt.hash_key())
+
+    def test_in_place_alphabeta(self):
+        """ Test that in-place alphabeta matches the copying search """
+        scores = []
+        for in_place in (False, True):
+            agentUT = game_agent.CustomPlayer(
+                4, game_agent.custom_score, False, 'alphabeta',
+                in_place=in_place)
+            agentUT.time_left = lambda: 1e3
+            board = isolation.Board(agentUT, self.player2)
+            board.apply_move((2, 3))
+            board.apply_move((0, 5))
+            before = board.to_string()
+            scores.append(agentUT.alphabeta(board, 4)[0])
+            self.assertEqual(before, board.to_string())
+        self.assertEqual(scores[0], scores[1])
+
 
 if __name__ == '__main__':
     unittest.main()
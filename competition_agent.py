@@ -3,7 +3,11 @@ you choose.  This agent will compete against other students (and past
 champions) in a tournament.
 
          COMPLETING AND SUBMITTING A COMPETITION AGENT IS OPTIONAL
+
+This agent uses Monte Carlo Tree Search (UCT), and keeps the part of its
+search tree below the moves actually played from one turn to the next.
 """
+import math
 import random
 
 
@@ -33,7 +37,63 @@ def custom_score(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    raise NotImplementedError
+    if game.is_loser(player):
+        return float("-inf")
+
+    if game.is_winner(player):
+        return float("inf")
+
+    own_moves = game.count_legal_moves(player)
+    opp_moves = game.count_legal_moves(game.get_opponent(player))
+    return float(own_moves - opp_moves)
+
+
+def random_rollout(game, score):
+    """Rollout policy that plays a uniformly random legal move."""
+    return random.choice(game.get_legal_moves())
+
+
+def greedy_rollout(game, score):
+    """Rollout policy that plays the legal move with the best `score` for
+    the player making it, breaking ties at random.
+    """
+    player = game.active_player
+    return max(game.get_legal_moves(),
+               key=lambda move: score(game.forecast_move(move), player))
+
+
+ROLLOUTS = {'random': random_rollout, 'greedy': greedy_rollout}
+
+
+class Node(object):
+    """A position in the search tree, reached by `move`.
+
+    `wins` counts the playouts through this node won by `player`, the player
+    who made `move`; `untried` lists the legal moves from the position that
+    have no child node yet, and `key` is the position's `Board.hash_key()`.
+
+    Nodes hold no reference to their parent, so that a subtree dropped from
+    the tree is freed as soon as it is released rather than whenever the
+    cyclic garbage collector next runs.
+    """
+    __slots__ = ('move', 'player', 'key', 'children', 'untried', 'visits',
+                 'wins')
+
+    def __init__(self, move, player, key, untried):
+        self.move = move
+        self.player = player
+        self.key = key
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0
+
+    def select(self, exploration):
+        """Return the child with the highest UCT value."""
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits +
+                   exploration * math.sqrt(log_visits / child.visits))
 
 
 class CustomPlayer:
@@ -55,18 +115,37 @@ class CustomPlayer:
         The name of the search method to use in get_move().
 
     timeout : float (optional)
-        Time remaining (in milliseconds) when search is aborted.  Note that
-        the PvP competition uses more accurate timers that are not cross-
-        platform compatible, so a limit of 1ms (vs 10ms for the other classes)
-        is generally sufficient.
+        Time remaining (in milliseconds) when search is aborted. It must
+        cover the time taken to return the move once the search stops, and
+        the timer resolution of `isolation.Board.play`.
+
+    rollout : {'random', 'greedy'} or callable (optional)
+        The playout policy: 'random' plays uniformly random moves, and
+        'greedy' the move with the best score for the player making it. A
+        callable is called as rollout(game, score) and must return one of
+        the legal moves of the active player.
+
+    exploration : float (optional)
+        The UCT exploration constant.
     """
 
-    def __init__(self, data=None, timeout=1.):
+    def __init__(self, data=None, timeout=10., rollout='random',
+                 exploration=math.sqrt(2)):
         self.score = custom_score
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
+        self.rollout = ROLLOUTS.get(rollout, rollout)
+        self.exploration = exploration
 
-    def get_move(self, game, time_left):
+        # The tree below the position after our last move, kept for reuse,
+        # and the rest of the last search tree, which is only released at
+        # the start of the next move so that freeing it does not delay the
+        # return of a move
+        self._root = None
+        self._discarded = None
+        self.search_stats = {}
+
+    def get_move(self, game, legal_moves, time_left=None):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
 
@@ -82,6 +161,12 @@ class CustomPlayer:
             An instance of `isolation.Board` encoding the current state of the
             game (e.g., player locations and blocked cells).
 
+        legal_moves : list<(int, int)> or callable
+            The legal moves of the active player, as passed by
+            `isolation.Board.play`; the search generates its own from `game`.
+            When get_move() is called as get_move(game, time_left), this is
+            the `time_left` function instead.
+
         time_left : callable
             A function that returns the number of milliseconds left in the
             current turn. Returning with any less than 0 ms remaining forfeits
@@ -93,5 +178,92 @@ class CustomPlayer:
             Board coordinates corresponding to a legal move; may return
             (-1, -1) if there are no available legal moves.
         """
-        # OPTIONAL: Finish this function!
-        raise NotImplementedError
+        self._discarded = None
+        if time_left is None and callable(legal_moves):
+            time_left = legal_moves
+        if not callable(time_left):
+            raise TypeError("get_move() requires a time_left function")
+        self.time_left = time_left
+        root = self.reuse_tree(game)
+        reused = root.visits
+
+        playouts = 0
+        try:
+            while time_left() > self.TIMER_THRESHOLD:
+                if not root.untried and not root.children:
+                    break
+                self.playout(game, root)
+                playouts += 1
+        except SearchTimeout:
+            pass
+
+        self.search_stats = {'playouts': playouts, 'reused_visits': reused,
+                             'root_visits': root.visits}
+        self._discarded = root
+        if not root.children:
+            # No playout finished in time: play any legal move
+            self._root = None
+            return random.choice(root.untried) if root.untried else (-1, -1)
+
+        # Play the most visited move, and keep its subtree for the next turn
+        best = max(root.children, key=lambda child: child.visits)
+        self._root = best
+        return best.move
+
+    def reuse_tree(self, game):
+        """Return the root node for a search from the position of `game`:
+        the node for it in the tree kept from the last move if there is one
+        (the opponent's reply to our last move), otherwise a new node.
+        """
+        key = game.hash_key()
+        old_root, self._root = self._root, None
+        if old_root is not None:
+            if old_root.key == key:
+                return old_root
+            for child in old_root.children:
+                if child.key == key:
+                    return child
+        return Node(None, game.inactive_player, key, game.get_legal_moves())
+
+    def playout(self, game, root):
+        """Run one iteration of MCTS from the root: select a path down the
+        tree with UCT, expand one new node, play the game out from there with
+        the rollout policy, and update the statistics of the nodes on the
+        path with the result.
+        """
+        board = game.copy()
+        node = root
+        path = [node]
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select(self.exploration)
+            board.apply_move(node.move)
+            path.append(node)
+
+        # Expansion; the new node is only added to the tree once its
+        # playout has finished in time
+        parent, index = node, None
+        if node.untried:
+            index = random.randrange(len(node.untried))
+            board.apply_move(node.untried[index])
+            node = Node(node.untried[index], board.inactive_player,
+                        board.hash_key(), board.get_legal_moves())
+            path.append(node)
+
+        # Rollout: the player left without a move loses
+        while board.count_legal_moves():
+            if self.time_left() < self.TIMER_THRESHOLD:
+                raise SearchTimeout()
+            board.apply_move(self.rollout(board, self.score))
+        winner = board.inactive_player
+
+        if index is not None:
+            parent.untried.pop(index)
+            parent.children.append(node)
+
+        # Backpropagation
+        for node in path:
+            node.visits += 1
+            if node.player is winner:
+                node.wins += 1
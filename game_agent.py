@@ -8,16 +8,199 @@ You must test your agent's strength against a set of agents with known
 relative strength using tournament.py and include the results in your report.
 """
 import itertools
+import multiprocessing
+import multiprocessing.connection
+import operator
+import os
 import random
+import timeit
+
+from my_heuristics import popcount, weighted_moves_score, reachable_score
+from my_heuristics import cut_off_reach_score, separated_paths
+
+# Bound types of transposition table entries
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Width of the windows used by principal variation search to test whether a
+# move beats the best score so far. Scores closer together than this are
+# treated as equal.
+NULL_WINDOW = 1e-6
+
+# Transposition table size used by MTD(f) and search reuse when none is
+# configured
+DEFAULT_TT_MEGABYTES = 16
+
+# The separated endgame solver is only tried on positions with at most
+# ENDGAME_CELLS blank cells, and gives up for the rest of a move once it has
+# memoised ENDGAME_BUDGET new regions during it, or runs out of time. Its
+# memo is cleared between moves once it holds ENDGAME_MEMO_LIMIT regions.
+ENDGAME_CELLS = 24
+ENDGAME_BUDGET = 2000
+ENDGAME_MEMO_LIMIT = 500000
+
+# Proof-number search expands at most PROOF_BUDGET nodes per move, in at most
+# PROOF_SHARE of the time left for it. Its cache of proven positions is
+# cleared between moves once it holds PROOF_CACHE_LIMIT of them.
+PROOF_BUDGET = 100000
+PROOF_SHARE = 0.5
+PROOF_CACHE_LIMIT = 500000
+
+# With adaptive clock checks, the search reads the clock often enough to run
+# for at most CLOCK_SHARE of the timeout margin between readings, at the node
+# rate last measured. The interval between readings at most doubles at each.
+CLOCK_SHARE = 0.1
+
+# Late move reductions search every move after the first LMR_MOVES at a node
+# one ply shallower, at nodes with at least LMR_DEPTH plies left to search
+LMR_MOVES = 3
+LMR_DEPTH = 3
+
+# Forced-move extensions search the moves of a node whose player has at most
+# FORCED_MOVES legal moves one ply deeper, as long as no path grows to twice
+# the depth of the search
+FORCED_MOVES = 2
+
+# Longest time, in seconds, get_move() waits for a pondering process to send
+# its results once told to stop
+PONDER_WAIT = 0.005
+
+# Safety factor applied to the predicted duration of the next iterative
+# deepening iteration before deciding whether it will finish in time
+PREDICTION_MARGIN = 1.5
 
-from my_heuristics import weighted_moves_score, reachable_score
-from my_heuristics import cut_off_reach_score
 
 class Timeout(Exception):
     """Subclass base exception for code clarity."""
     pass
 
 
+class TranspositionTable(object):
+    """Fixed-size table of search results keyed by `Board.hash_key()`.
+
+    The table is split into buckets of two entries. The first entry of a
+    bucket is depth-preferred: it is only replaced by a result for the same
+    position or one searched at least as deeply. The second entry always
+    takes the newest result that the first one rejects, so recent positions
+    are still found without evicting the expensive deep ones.
+
+    Entries are tuples of (key, depth, score, bound, move), where bound is
+    one of EXACT, LOWER or UPPER.
+
+    Parameters
+    ----------
+    megabytes : float
+        Approximate cap on the memory used by the table.
+    """
+    # Rough size of one filled slot: the entry tuple, its key and score
+    # objects and the list pointer to it (moves are shared with the board)
+    ENTRY_BYTES = 150
+
+    def __init__(self, megabytes):
+        self.buckets = max(1, int(megabytes * 2**20) // (2 * self.ENTRY_BYTES))
+        self.clear()
+
+    def clear(self):
+        self.table = [None] * (2 * self.buckets)
+
+    def probe(self, key):
+        """Return the entry stored for a position key, or None."""
+        idx = 2 * (key % self.buckets)
+        entry = self.table[idx]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.table[idx + 1]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """Record the result of searching a position to a given depth."""
+        idx = 2 * (key % self.buckets)
+        deep = self.table[idx]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            self.table[idx] = (key, depth, score, bound, move)
+        else:
+            self.table[idx + 1] = (key, depth, score, bound, move)
+
+
+class ProofNode(object):
+    """A position in a proof-number search tree, reached by `move`.
+
+    The attacker is the player to move at the root of the search, and
+    `attacker` is True at the nodes where it is to move. `pn` and `dn`, the
+    proof and disproof numbers, are the least number of leaves that must
+    still be solved to prove that the attacker wins from the position, or
+    that it loses.
+    """
+    __slots__ = ('board', 'key', 'move', 'parent', 'children', 'attacker',
+                 'pn', 'dn')
+
+    def __init__(self, board, key, move, parent, attacker, pn, dn):
+        self.board = board
+        self.key = key
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.attacker = attacker
+        self.pn = pn
+        self.dn = dn
+
+
+class SearchStats(object):
+    """Counters describing the search behind one get_move() call.
+
+    `nodes` counts every position the search visits and `leaves` the ones
+    scored with the heuristic; `cutoffs[i]` counts the alpha-beta cutoffs
+    caused by the i-th child searched at a node. `iterations` holds a
+    (depth, nodes, milliseconds) tuple for each completed iteration of
+    iterative deepening (or the single fixed-depth search), and `depth` is
+    the deepest of them. `time` is the duration of the whole search in
+    milliseconds, and `workers` the number of processes that shared it.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = []
+        self.depth = 0
+        self.iterations = []
+        self.time = 0.
+        self.workers = 1
+
+    def record_cutoff(self, index):
+        while len(self.cutoffs) <= index:
+            self.cutoffs.append(0)
+        self.cutoffs[index] += 1
+
+    def first_cutoff_rate(self):
+        """Return the fraction of cutoffs caused by the first child searched;
+        close to 1 when moves are well ordered.
+        """
+        total = sum(self.cutoffs)
+        return self.cutoffs[0] / total if total else 0.
+
+    def nps(self):
+        """Return the number of nodes searched per second."""
+        return 1000. * self.nodes / self.time if self.time else 0.
+
+    def ebf(self):
+        """Return the effective branching factor of the deepest iteration:
+        the ratio of its node count to that of the iteration before it, or
+        0 if fewer than two iterations completed.
+        """
+        if len(self.iterations) < 2 or not self.iterations[-2][1]:
+            return 0.
+        return self.iterations[-1][1] / self.iterations[-2][1]
+
+    def as_dict(self):
+        return {'depth': self.depth, 'nodes': self.nodes,
+                'leaves': self.leaves, 'cutoffs': sum(self.cutoffs),
+                'cutoffs_by_child': list(self.cutoffs),
+                'first_cutoff_rate': self.first_cutoff_rate(),
+                'iterations': list(self.iterations), 'time': self.time,
+                'nps': self.nps(), 'ebf': self.ebf(), 'workers': self.workers}
+
+
 def custom_score(game, player):
     """Calculate the heuristic value of a game state from the point of view
     of the given player.
@@ -114,24 +297,195 @@ class CustomPlayer:
         Flag indicating whether to perform fixed-depth search (False) or
         iterative deepening search (True).
 
-    method : {'minimax', 'alphabeta'} (optional)
-        The name of the search method to use in get_move().
+    method : {'minimax', 'alphabeta', 'pvs', 'mtdf'} (optional)
+        The name of the search method to use in get_move(). 'pvs' is
+        alpha-beta with principal variation (NegaScout) null-window probes;
+        with iterative deepening, each iteration after the first also starts
+        from an aspiration window around the previous iteration's score.
+        'mtdf' finds each iteration's score with a series of null-window
+        alpha-beta searches, starting from the previous iteration's score,
+        and always uses a transposition table.
 
     timeout : float (optional)
         Time remaining (in milliseconds) when search is aborted. Should be a
         positive value large enough to allow the function to return before the
         timer expires.
+
+    in_place : boolean (optional)
+        Flag indicating whether the search should walk the game tree on the
+        board it was given, using `push_move`/`pop_move` (True), or expand
+        each child with `forecast_move` (False). In-place search only ever
+        holds one board, plus an undo record per ply of depth.
+
+    tt_megabytes : float (optional)
+        Size of the transposition table used to reuse search results between
+        the iterations of one get_move() call, in megabytes. Zero (the
+        default) disables the table.
+
+    ordering : boolean (optional)
+        Flag indicating whether alpha-beta should order the moves it searches
+        at each node: the best move from the previous iteration (or the
+        transposition table) first, then that ply's killer moves, then the
+        rest by how often they have caused cutoffs (the history heuristic).
+        Otherwise moves are searched in the order get_legal_moves() returns.
+
+    aspiration : float (optional)
+        Half-width of the aspiration window used by 'pvs' iterative
+        deepening. A search that fails outside the window is repeated with
+        that side of the window opened fully.
+
+    predictive : boolean (optional)
+        Flag indicating whether iterative deepening should decide when to
+        stop by predicting the duration of the next iteration from those
+        already completed (see predict_iteration()), and only start it if it
+        is expected to finish in time. Deepening also stops once the score is
+        a proven win or loss, or the search already reaches the end of the
+        game. Otherwise a new iteration is started whenever at least 13 times
+        the timeout margin is left.
+
+    ponder : boolean (optional)
+        Flag indicating whether the agent should keep searching in a forked
+        process after get_move() returns, while the opponent chooses its
+        reply (see start_pondering()). The transposition table, if any, is
+        kept between moves and receives the principal variations found by
+        the background search, and iterative deepening from a position that
+        was pondered starts one ply deeper than the background search
+        reached, with its best move. The process runs alongside the
+        opponent, so it only leaves the opponent's speed alone when there is
+        a spare core; it is lost when `Board.play` runs each move in a child
+        process.
+
+    workers : int (optional)
+        Number of processes to run iterative deepening on (see
+        parallel_search()). With more than one, each worker searches its own
+        share of the root moves, and the results are merged at the deepest
+        depth every worker has completed.
+
+    endgame : boolean (optional)
+        Flag indicating whether the search should solve positions where the
+        players can no longer reach any of the same cells exactly, by
+        comparing the longest knight's paths each player has left in its own
+        region (see solve_endgame()), instead of searching them.
+
+    book : object (optional)
+        An opening book: an object with a lookup(game) method that returns
+        the move to play in a position, or None if it has none, such as the
+        OpeningBook built by my-board/opening_book.py. get_move() plays any
+        legal book move without searching.
+
+    proof_cells : int (optional)
+        Number of blank cells at or below which get_move() first tries to
+        solve the position exactly with proof-number search (see prove()),
+        and plays a proven result without searching. Positions proven along
+        the way are cached between moves, and the search returns their
+        result as soon as it reaches one. Zero (the default) disables the
+        solver.
+
+    reuse : boolean (optional)
+        Flag indicating whether to keep the transposition table, killer
+        moves and history between get_move() calls. When the opponent's
+        reply to our last move leads to the position searched, iterative
+        deepening starts two plies short of the depth the last search
+        reached, with the best move stored for the position. A table of
+        DEFAULT_TT_MEGABYTES is used if none is configured.
+
+    adaptive_clock : boolean (optional)
+        Flag indicating whether the search should read the clock only every
+        so many nodes, rather than at every node (see read_clock()). The
+        interval adapts to the measured node rate, so that the search still
+        stops with most of the timeout margin left.
+
+    reductions : boolean (optional)
+        Flag indicating whether alpha-beta should use late move reductions:
+        search the moves ordered late at a node (after the first LMR_MOVES,
+        at nodes with LMR_DEPTH or more plies left) one ply shallower, and
+        search them again to the full depth only if they beat the best score
+        so far. Best combined with ordering.
+
+    extensions : boolean (optional)
+        Flag indicating whether the search should extend forced positions:
+        the moves of a player with FORCED_MOVES or fewer legal moves are
+        searched one ply deeper, up to twice the depth of the search.
     """
 
     def __init__(self, search_depth=3, score_fn=custom_score,
-                 iterative=True, method='minimax', timeout=10.):
+                 iterative=True, method='minimax', timeout=10., in_place=False,
+                 tt_megabytes=0, ordering=False, aspiration=1.,
+                 predictive=False, ponder=False, workers=1, endgame=False,
+                 book=None, proof_cells=0, reuse=False, adaptive_clock=False,
+                 reductions=False, extensions=False):
         self.search_depth = search_depth
         self.iterative = iterative
         self.score = score_fn
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
-
-        self.fn = self.minimax if method == 'minimax' else self.alphabeta
+        self.in_place = in_place
+        if (method == 'mtdf' or reuse) and not tt_megabytes:
+            tt_megabytes = DEFAULT_TT_MEGABYTES
+        self.tt = TranspositionTable(tt_megabytes) if tt_megabytes else None
+        self.ordering = ordering
+        self.predictive = predictive
+        self.ponder = ponder
+        # The (process, connection, stop event) of the pondering process, and
+        # whether it has been sent a search that has not been stopped yet
+        self._ponderer = None
+        self._pondering = False
+        self.workers = workers
+        self.endgame = endgame
+        self.book = book
+        # The memoised regions of the endgame solver, the board size they
+        # belong to, and the memo size at which it gives up for this move
+        self._endgame_memo = {}
+        self._endgame_size = None
+        self._endgame_limit = ENDGAME_BUDGET
+        self.proof_cells = proof_cells
+        self._proofs = {}
+
+        # Hashes of the positions the opponent can reply to our last move
+        # with, and the depth the search behind that move reached
+        self.reuse = reuse
+        self._replies = set()
+        self._reuse_depth = 0
+
+        # Whether this agent was player 1, and the move count, at its last
+        # move. The transposition table keeps scores from this agent's point
+        # of view but is keyed by position alone, so it is only valid while
+        # the agent keeps its seat in the same game.
+        self._seat = None
+        self._game_ply = -1
+
+        # The first depth searched by a search that reuses the last one's
+        # results (0 if this one does not), and the last effective branching
+        # factor measured by predict_iteration()
+        self._reuse_from = 0
+        self._ebf = 0.
+
+        # Adaptive clock checks: nodes left until the next reading of the
+        # clock, nodes between readings, and the time of the last reading
+        self.adaptive_clock = adaptive_clock
+        self.reductions = reductions
+        self.extensions = extensions
+        self._clock_in = self._clock_every = 1
+        self._clock_at = timeit.default_timer()
+
+        # Move ordering state: the best root move of the last completed
+        # iteration, up to two killer moves per ply, and cutoff history per
+        # side to move (indexed by the maximise flag)
+        self._root_ply = 0
+        self._root_depth = 0
+        self._pv_move = None
+        self.killers = []
+        self.history = ({}, {})
+
+        # Statistics from the most recent get_move(), read by Board.play()
+        # when it records telemetry. The search itself counts into _stats,
+        # which a pondering process replaces with its own.
+        self.search_stats = self._stats = SearchStats()
+
+        self.method = method
+        self.aspiration = aspiration
+        self.fn = {'minimax': self.minimax, 'pvs': self.pvs,
+                   'mtdf': self.mtdf}.get(method, self.alphabeta)
 
     def get_move(self, game, legal_moves, time_left):
         """Search for the best move from the available legal moves and return a
@@ -168,16 +522,74 @@ class CustomPlayer:
             Board coordinates corresponding to a legal move; may return
             (-1, -1) if there are no available legal moves.
         """
+        key = game.hash_key()
+        pondered = self.stop_pondering().get(key)
+        seat = game.__player_1__ is self
+        if seat != self._seat or game.move_count <= self._game_ply:
+            self.forget_game()
+            pondered = None
+        self._seat, self._game_ply = seat, game.move_count
+        self.search_stats = self._stats = stats = SearchStats()
+        start = timeit.default_timer()
+
         best = (-1, -1) if not legal_moves else random.choice(legal_moves)
         if not legal_moves:
             return best
 
+        if self.book is not None:
+            move = self.book.lookup(game)
+            if move in legal_moves:
+                return move
+
         self.time_left = time_left
+        budget = time_left()
+        self._clock_in = self._clock_every = 1
+        self._clock_at = timeit.default_timer()
+        if len(self._endgame_memo) > ENDGAME_MEMO_LIMIT:
+            self._endgame_memo = {}
+        self._endgame_limit = len(self._endgame_memo) + ENDGAME_BUDGET
+        if len(self._proofs) > PROOF_CACHE_LIMIT:
+            self._proofs = {}
+        blank_cells = popcount(game.get_blank_mask())
+        if self.proof_cells and blank_cells <= self.proof_cells:
+            proven = self.prove(game, PROOF_SHARE * (budget - self.TIMER_THRESHOLD))
+            if proven is not None:
+                stats.time = 1000 * (timeit.default_timer() - start)
+                return proven[1]
+
+        if self.tt is not None and not (self.ponder or self.reuse):
+            self.tt.clear()
+        self._pv_move = None
+        reused = self.reuse and key in self._replies
+        if reused and game.move_count - self._root_ply == 2:
+            # The killers of the last search, from our own last root, are two
+            # plies deeper than the same plies of this one
+            del self.killers[:2]
+        else:
+            self.killers = []
+            self.history = ({}, {})
 
         # Perform any required initializations, including selecting an initial
         # move from the game board (i.e., an opening book), or returning
         # immediately if there are no legal moves
         depths = itertools.count(1) if self.iterative else (self.search_depth,)
+        score = None
+        self._reuse_from = 0
+        if reused and self.iterative:
+            self._reuse_from = max(1, self._reuse_depth - 2)
+            depths = itertools.count(self._reuse_from)
+            entry = self.tt.probe(key)
+            if entry is not None and entry[4] in legal_moves:
+                best = self._pv_move = entry[4]
+                if entry[3] == EXACT:
+                    score = entry[2]
+        if pondered is not None and self.iterative:
+            ponder_depth, score, best = pondered
+            self._pv_move = best
+            depths = itertools.count(ponder_depth + 1)
+        if self.workers > 1 and self.iterative:
+            best = self.parallel_search(game, legal_moves, best)
+            depths = ()
 
         try:
             # The search method call (alpha beta or minimax) should happen in
@@ -185,27 +597,559 @@ class CustomPlayer:
             # automatically catch the exception raised by the search method
             # when the timer gets close to expiring
             for depth in depths:
-                _, best = self.fn(game, depth, maximizing_player=True)
-                if self.time_left() < 13 * self.TIMER_THRESHOLD:
+                iteration_start = timeit.default_timer()
+                iteration_nodes = stats.nodes
+                score, best = self.search_iteration(game, depth, score)
+                self._pv_move = best
+                stats.depth = depth
+                stats.iterations.append(
+                    (depth, stats.nodes - iteration_nodes,
+                     1000 * (timeit.default_timer() - iteration_start)))
+                if self.predictive:
+                    if (abs(score) == float('inf') or depth >= blank_cells or
+                            self.predict_iteration() >
+                            self.time_left() - self.TIMER_THRESHOLD):
+                        break
+                elif self.time_left() < 13 * self.TIMER_THRESHOLD:
                     break
 
         except Timeout:
             # Handle any actions required at timeout, if necessary
             pass
 
+        stats.time = 1000 * (timeit.default_timer() - start)
+        if self.reuse:
+            board = game.forecast_move(best)
+            self._replies = {board.forecast_move(reply).hash_key()
+                             for reply in board.get_legal_moves()}
+            self._reuse_depth = stats.depth
+        if self.ponder:
+            self.start_pondering(game, best, budget)
+
         # Return the best move from the last completed search iteration
         return best
 
+    def forget_game(self):
+        """Forget everything carried over from the agent's earlier moves:
+        the transposition table, the replies a reused search expects, and
+        the killers and history used to order moves. get_move() calls this
+        when a new game starts or the agent changes seats.
+        """
+        if self.tt is not None:
+            self.tt.clear()
+        self._replies = set()
+        self._reuse_depth = 0
+        self.killers = []
+        self.history = ({}, {})
+
+    def parallel_search(self, game, legal_moves, default):
+        """Search for the best move with iterative deepening on up to
+        self.workers forked processes, dealing the root moves out between
+        them, and return it (or `default` if any worker failed to complete a
+        search).
+
+        Each worker reports every iteration it completes over its share of
+        the moves. Workers stop at the time limit, or once their result is
+        proven or reaches the end of the game. The best move is chosen from
+        each worker's result at the deepest depth all of the still-running
+        workers have completed, and the iterations of self.search_stats
+        record the combined nodes and finishing time of each such depth.
+        """
+        stats = self._stats
+        start = timeit.default_timer()
+        deadline = start + (self.time_left() - self.TIMER_THRESHOLD) / 1000.
+        moves = list(legal_moves)
+        stats.workers = workers = min(self.workers, len(moves))
+
+        context = multiprocessing.get_context('fork')
+        conns, processes = [], []
+        for index in range(workers):
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(target=self._root_split_worker,
+                                      args=(child_conn, game, moves[index::workers],
+                                            start, deadline))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            conns.append(parent_conn)
+            processes.append(process)
+
+        # Each worker sends (depth, score, move, milliseconds, nodes, leaves,
+        # cutoffs) after every iteration, with counters totalled so far
+        reports = [[] for _ in conns]
+        running = list(conns)
+        try:
+            while running:
+                timeout = deadline - timeit.default_timer()
+                if timeout <= 0:
+                    break
+                for conn in multiprocessing.connection.wait(running, timeout):
+                    try:
+                        reports[conns.index(conn)].append(conn.recv())
+                    except EOFError:
+                        running.remove(conn)
+        finally:
+            for process in processes:
+                process.kill()
+                process.join()
+            for conn in conns:
+                conn.close()
+
+        # A worker that has stopped short of a proven result or the end of
+        # the game ran out of time
+        blank_cells = popcount(game.get_blank_mask())
+        unfinished = [len(r) for r in reports if not r or
+                      abs(r[-1][1]) != float('inf') and len(r) < blank_cells]
+        depth = min(unfinished) if unfinished else max(map(len, reports))
+
+        for worker_reports in filter(None, reports):
+            nodes, leaves, cutoffs = worker_reports[-1][4:]
+            stats.nodes += nodes
+            stats.leaves += leaves
+            stats.cutoffs.extend([0] * (len(cutoffs) - len(stats.cutoffs)))
+            for index, count in enumerate(cutoffs):
+                stats.cutoffs[index] += count
+        for ply in range(1, depth + 1):
+            done = [r for r in reports if len(r) >= ply]
+            nodes = sum(r[ply - 1][4] - (r[ply - 2][4] if ply > 1 else 0)
+                        for r in done)
+            stats.iterations.append((ply, nodes, max(r[ply - 1][3] for r in done)))
+        stats.depth = depth
+
+        # Moves can only be compared once all of them have been searched
+        if not depth:
+            return default
+        best, best_score = default, None
+        for worker_reports in reports:
+            if worker_reports:
+                _, score, move = worker_reports[min(depth, len(worker_reports)) - 1][:3]
+                if best_score is None or score > best_score:
+                    best, best_score = move, score
+        return best
+
+    def _root_split_worker(self, conn, game, moves, start, deadline):
+        # Body of a parallel_search() worker process: iterative deepening
+        # over a subset of the root moves, reporting each iteration
+        self.time_left = lambda: 1000 * (deadline - timeit.default_timer())
+        self._stats = stats = SearchStats()
+        blank_cells = popcount(game.get_blank_mask())
+        try:
+            for depth in itertools.count(1):
+                score, best = self.search_root_moves(game, moves, depth)
+                self._pv_move = best
+                conn.send((depth, score, best,
+                           1000 * (timeit.default_timer() - start),
+                           stats.nodes, stats.leaves, stats.cutoffs))
+                if abs(score) == float('inf') or depth >= blank_cells:
+                    break
+        except Timeout:
+            pass
+        finally:
+            conn.close()
+
+    def search_root_moves(self, game, moves, depth):
+        """Search a subset of the legal moves from the root to a fixed depth,
+        the best move of the previous iteration first, and return the best
+        (score, move) among them. 'minimax' agents use minimax below the
+        root, 'pvs' agents principal variation search, and all others
+        alpha-beta.
+        """
+        self._root_ply = game.move_count
+        self._root_depth = depth
+        alphabeta = self.method != 'minimax'
+        pvs = self.method == 'pvs'
+        best, alpha = None, float('-inf')
+        for move in sorted(moves, key=lambda move: move != self._pv_move):
+            args = (game.forecast_move(move), depth - 1, False, alphabeta)
+            if alphabeta:
+                args += (alpha, float('inf'), pvs)
+            score, _ = self._minimax_alphabeta(*args)
+            if best is None or score > alpha:
+                best, alpha = move, score
+        return alpha, best
+
+    def search_iteration(self, game, depth, score=None):
+        """Run one iteration of iterative deepening with the configured
+        search method, given the score of the previous iteration (None for
+        the first), and return its (score, move).
+        """
+        finite = score is not None and abs(score) != float('inf')
+        if self.method == 'pvs' and finite:
+            return self.aspiration_search(game, depth, score)
+        if self.method == 'mtdf':
+            return self.mtdf(game, depth, score if finite else 0.)
+        return self.fn(game, depth, maximizing_player=True)
+
+    def start_pondering(self, game, move, budget):
+        """Start searching the opponent's replies to `move` in a background
+        process, for at most `budget` milliseconds or until the next call to
+        get_move() (see stop_pondering()).
+
+        The search deepens one ply at a time across all of the replies until
+        the result for every reply is a proven win or loss or reaches the end
+        of the game. It records the (depth, score, best move) of the last
+        completed iteration for each reply, keyed by the hash of the position
+        the reply leads to, along with the transposition table entries on
+        the principal variation from that position.
+
+        The process is forked on first use and serves every later request,
+        so the pages it shares with this one are only copied once, until
+        close() is called. It keeps its own copy of the agent, including the
+        transposition table, from the time it was forked, and forgets it
+        (see forget_game()) when a request comes from a new game or seat.
+        """
+        board = game.forecast_move(move)
+        if not board.get_legal_moves():
+            return
+        if self._ponderer is None:
+            context = multiprocessing.get_context('fork')
+            stop = context.Event()
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=self._ponder_worker,
+                                      args=(child_conn, stop))
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self._ponderer = (process, parent_conn, stop)
+        process, conn, stop = self._ponderer
+
+        # The players are replaced by whether they are this agent, so that
+        # neither has to be sent to the process
+        players = [player is self for player in (game.__player_1__, game.__player_2__)]
+        deadline = timeit.default_timer() + budget / 1000.
+        stop.clear()
+        conn.send((board.with_players(*players), deadline))
+        self._pondering = True
+
+    def _ponder_worker(self, conn, stop):
+        # Body of the start_pondering() process: for each request, search the
+        # replies until stopped or out of time, then send the results. The
+        # lowest scheduling priority keeps it from taking time from the
+        # opponent on a shared core.
+        os.nice(19)
+        self._ponderer = None
+        self._pondering = False
+        self.time_left = lambda: (float('-inf') if stop.is_set() else
+                                  1000 * (deadline - timeit.default_timer()))
+        while True:
+            try:
+                board, deadline = conn.recv()
+            except EOFError:
+                return
+            if (board.__player_1__ != self._seat or
+                    board.move_count <= self._game_ply):
+                self.forget_game()
+            self._seat, self._game_ply = board.__player_1__, board.move_count
+            board = board.with_players(*(self if mine else 'opponent'
+                                         for mine in (board.__player_1__,
+                                                      board.__player_2__)))
+            self._stats = SearchStats()
+            self.killers = []
+            self.history = ({}, {})
+            results = {}
+            pending = [board.forecast_move(reply) for reply in board.get_legal_moves()]
+            pending = [child for child in pending if child.get_legal_moves()]
+            try:
+                for depth in itertools.count(1):
+                    if not pending:
+                        break
+                    for child in list(pending):
+                        key = child.hash_key()
+                        score, best = results.get(key, (0, None, None, None))[1:3]
+                        self._pv_move = best
+                        score, best = self.search_iteration(child, depth, score)
+                        results[key] = (depth, score, best, self.pv_entries(child))
+                        if (abs(score) == float('inf') or
+                                depth >= popcount(child.get_blank_mask())):
+                            pending.remove(child)
+            except Timeout:
+                pass
+            conn.send(results)
+
+    def pv_entries(self, game):
+        """Return the transposition table entries along the principal
+        variation from a position: the entry for the position, then for the
+        position after its stored move, and so on.
+        """
+        entries = []
+        while self.tt is not None:
+            entry = self.tt.probe(game.hash_key())
+            if entry is None or entry[4] not in game.get_legal_moves():
+                break
+            entries.append(entry)
+            game = game.forecast_move(entry[4])
+        return entries
+
+    def stop_pondering(self, wait=PONDER_WAIT):
+        """Stop any background search started by start_pondering(), waiting
+        at most `wait` seconds for its results, and return them as a dict
+        from position hash to (depth, score, move). The transposition table
+        entries on the principal variation of each result are added to the
+        table. A process that does not answer in time is killed, and a new
+        one forked when it is next needed.
+        """
+        if not self._pondering:
+            return {}
+        self._pondering = False
+        process, conn, stop = self._ponderer
+        stop.set()
+        results = None
+        try:
+            if conn.poll(wait):
+                results = conn.recv()
+        except EOFError:
+            pass
+        if results is None:
+            self.close()
+            return {}
+
+        pondered = {}
+        for key, (depth, score, best, entries) in results.items():
+            pondered[key] = (depth, score, best)
+            if self.tt is not None:
+                for entry in entries:
+                    self.tt.store(*entry)
+        return pondered
+
+    def close(self):
+        """Kill the pondering process, if there is one. The agent can still
+        be used, and forks a new process if it ponders again.
+        """
+        self._pondering = False
+        if self._ponderer is not None:
+            process, conn, _ = self._ponderer
+            process.kill()
+            process.join()
+            conn.close()
+            self._ponderer = None
+
+    def predict_iteration(self):
+        """Return the expected duration, in milliseconds, of the next
+        iterative deepening iteration: the last iteration's time multiplied
+        by the effective branching factor. Alpha-beta trees grow unevenly
+        between odd and even depths, so once three iterations have completed
+        the factor is averaged over the last two of them. The estimate is
+        scaled up by PREDICTION_MARGIN.
+
+        A search that reuses the results of the last one (see get_move())
+        answers its first iteration from the transposition table, so that
+        iteration is left out, and until two more have completed the factor
+        measured by the last search is used.
+        """
+        iterations = [it for it in self.search_stats.iterations
+                      if it[0] > self._reuse_from]
+        nodes = [it[1] for it in iterations[-3:]]
+        if len(nodes) >= 2 and nodes[0]:
+            self._ebf = (nodes[-1] / nodes[0]) ** (1. / (len(nodes) - 1))
+        elif not (iterations and self._reuse_from):
+            return 0.
+        return iterations[-1][2] * self._ebf * PREDICTION_MARGIN
+
+    def order_moves(self, moves, first, ply, maximise):
+        """Sort a list of moves in place for searching: `first` (a best move
+        from an earlier search), then the killer moves of the ply, then the
+        rest by descending history score.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history[maximise]
+
+        def rank(move):
+            if move == first:
+                return (0, 0)
+            if move in killers:
+                return (1, killers.index(move))
+            return (2, -history.get(move, 0))
+
+        moves.sort(key=rank)
+
+    def record_cutoff(self, move, index, ply, depth, maximise):
+        """Update cutoff statistics, killer moves and history for a move that
+        caused an alpha-beta cutoff as the `index`-th child searched.
+        """
+        self._stats.record_cutoff(index)
+        if not self.ordering:
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        history = self.history[maximise]
+        history[move] = history.get(move, 0) + depth * depth
+
+    def aspiration_search(self, game, depth, guess):
+        """Search to a fixed depth with a window of +/- self.aspiration around
+        a guessed score, widening the window and searching again whenever the
+        result falls outside it.
+        """
+        alpha, beta = guess - self.aspiration, guess + self.aspiration
+        while True:
+            score, move = self.fn(game, depth, alpha, beta, maximizing_player=True)
+            if score <= alpha and alpha != float('-inf'):
+                alpha = float('-inf')
+            elif score >= beta and beta != float('inf'):
+                beta = float('inf')
+            else:
+                return score, move
+
+    def solve_endgame(self, game):
+        """Return the exact (score, move) of a position in which the players
+        have been separated, or None if they have not, the position has more
+        than ENDGAME_CELLS blank cells, or the solver gave up (after
+        memoising ENDGAME_BUDGET new regions since the start of the move, or
+        at the time limit).
+
+        Once separated, each player can only make the moves of the longest
+        path through its own region, and the player to move wins if and
+        only if its path is longer than its opponent's. The move returned is
+        the first step of the active player's longest path.
+        """
+        if game.width * game.height - game.move_count > ENDGAME_CELLS:
+            return None
+        if (game.width, game.height) != self._endgame_size:
+            self._endgame_limit -= len(self._endgame_memo)
+            self._endgame_memo = {}
+            self._endgame_size = (game.width, game.height)
+        paths = separated_paths(
+            game, self._endgame_memo, self._endgame_limit,
+            lambda: self.time_left() < self.TIMER_THRESHOLD)
+        if paths is None:
+            return None
+        (length, first), (other_length, _) = paths
+        active_wins = length > other_length
+        score = float('inf') if active_wins == (game.active_player is self) else float('-inf')
+        move = (-1, -1) if first is None else game.move_table.coords[first]
+        return score, move
+
+    def prove(self, game, limit):
+        """Try to solve a position exactly with proof-number search, for at
+        most `limit` milliseconds and PROOF_BUDGET expanded nodes, and return
+        its (score, move), or None if it could not be solved in time.
+
+        The search grows a tree from the position, always expanding the
+        most-proving node: the leaf whose solution would do most to prove
+        or disprove that the player to move wins. A new node starts with
+        proof and disproof numbers of 1 and its number of legal moves (the
+        other way around when the defender is to move), unless its result
+        is already cached. Every position the search solves is added to the
+        cache, keyed by Board.hash_key(), with the move that wins it (or any
+        legal move if it is lost).
+        """
+        proven = self.proven(game)
+        if proven is not None:
+            return proven
+
+        deadline = timeit.default_timer() + limit / 1000.
+        root = current = self._proof_node(game, None, None, True)
+        by_pn, by_dn = operator.attrgetter('pn'), operator.attrgetter('dn')
+        nodes = 0
+        while root.pn and root.dn:
+            if nodes >= PROOF_BUDGET or timeit.default_timer() > deadline:
+                break
+
+            # Select the most-proving node: the child with the smallest proof
+            # number where the attacker is to move, and the smallest
+            # disproof number where the defender is
+            node = current
+            while node.children:
+                node = min(node.children, key=by_pn if node.attacker else by_dn)
+
+            board = node.board
+            node.children = [self._proof_node(board.forecast_move(move), move,
+                                              node, not node.attacker)
+                             for move in board.get_legal_moves()]
+            nodes += len(node.children)
+
+            # Update the numbers of the ancestors, until one is unchanged.
+            # The numbers above it are unchanged too, so the next
+            # most-proving node is below it.
+            current = root
+            while node is not None:
+                children = node.children
+                if node.attacker:
+                    pn = min(map(by_pn, children))
+                    dn = sum(map(by_dn, children))
+                else:
+                    pn = sum(map(by_pn, children))
+                    dn = min(map(by_dn, children))
+                if pn == node.pn and dn == node.dn:
+                    current = node
+                    break
+                node.pn, node.dn = pn, dn
+                node = node.parent
+        self._stats.nodes += nodes
+
+        # Cache every position solved
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            if node.children and not (node.pn and node.dn):
+                wins = (node.pn == 0) == node.attacker
+                move = node.children[0].move
+                if wins:
+                    won = 'pn' if node.attacker else 'dn'
+                    move = next(child.move for child in node.children
+                                if not getattr(child, won))
+                self._proofs[node.key] = (wins, move)
+        return self.proven(game)
+
+    def _proof_node(self, board, move, parent, attacker):
+        # Create a proof-number search node for a position, solved if the
+        # player to move has no legal moves or the position is cached
+        key = board.hash_key()
+        if key in self._proofs:
+            wins = self._proofs[key][0]
+        else:
+            moves = board.count_legal_moves()
+            if moves:
+                pn, dn = (1, moves) if attacker else (moves, 1)
+                return ProofNode(board, key, move, parent, attacker, pn, dn)
+            wins = False
+        pn, dn = (0, float('inf')) if wins == attacker else (float('inf'), 0)
+        return ProofNode(board, key, move, parent, attacker, pn, dn)
+
+    def proven(self, game):
+        """Return the (score, move) of a position that prove() has solved,
+        or None if it has not.
+        """
+        proof = self._proofs.get(game.hash_key())
+        if proof is None:
+            return None
+        wins, move = proof
+        score = float('inf') if wins == (game.active_player is self) else float('-inf')
+        return score, move
+
+    def read_clock(self):
+        """Raise Timeout if the search has less than TIMER_THRESHOLD
+        milliseconds left, and otherwise set the number of nodes to search
+        before reading the clock again: as many as the search is expected to
+        visit in CLOCK_SHARE of the threshold, at the rate measured since the
+        last reading, but no more than twice as many as last time.
+        """
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise Timeout()
+        now = timeit.default_timer()
+        elapsed = 1000 * (now - self._clock_at)
+        target = CLOCK_SHARE * self.TIMER_THRESHOLD * self._clock_every
+        every = 2 * self._clock_every
+        if elapsed > 0:
+            every = min(every, int(target / elapsed))
+        self._clock_in = self._clock_every = max(1, every)
+        self._clock_at = now
+
     def cut_off_test(self, game, depth):
         utility = game.utility(self)
         if bool(utility):
             return (True, utility, (-1, -1))
         if not depth:
+            self._stats.leaves += 1
             return (True, self.score(game, self), (-1, -1))
         return (False, None, (-1, -1))
 
     def _minimax_alphabeta(self, game, depth, maximise, alphabeta=False,
-                           alpha=None, beta=None):
+                           alpha=None, beta=None, pvs=False):
         # This function consolidates the original individual minimax and alpha-
         # beta functions to eliminate redundant code and simplify maintenance.
         # If you'd like to see the original, stand-alone functions, based on
@@ -214,34 +1158,111 @@ class CustomPlayer:
         #                                 and
         # https://github.com/aimacode/aima-pseudocode/blob/master/md/Alpha-Beta-Search.md
         # see commit 58234398f6d6852b203822d1dd1bac185166607e in this repo.
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.adaptive_clock:
+            self._clock_in -= 1
+            if self._clock_in <= 0:
+                self.read_clock()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise Timeout()
+        self._stats.nodes += 1
 
         cut_off, score, move = self.cut_off_test(game, depth)
         if cut_off: return score, move
+        if self.endgame:
+            solved = self.solve_endgame(game)
+            if solved is not None:
+                return solved
+        if (self.proof_cells and
+                game.width * game.height - game.move_count <= self.proof_cells):
+            proven = self.proven(game)
+            if proven is not None:
+                return proven
+
+        tt_move = None
+        if self.tt is not None:
+            key = game.hash_key()
+            entry = self.tt.probe(key)
+            if entry is not None:
+                _, tt_depth, tt_score, tt_bound, tt_move = entry
+                if tt_depth >= depth and (tt_bound == EXACT or alphabeta and (
+                        tt_bound == LOWER and tt_score >= beta or
+                        tt_bound == UPPER and tt_score <= alpha)):
+                    return tt_score, tt_move
+            alpha0, beta0 = alpha, beta
 
         best = None
-        deeper = depth-1
         max_or_min = not maximise
         v = float('-inf') if maximise else float('inf')
 
+        ply = game.move_count - self._root_ply
         legal_moves = game.get_legal_moves()
-        for move in legal_moves:
-            args = (game.forecast_move(move), deeper, max_or_min, alphabeta)
-            if alphabeta:
-                args += (alpha, beta)
-            score, _ = self._minimax_alphabeta(*args)
-
+        deeper = depth-1
+        if (self.extensions and len(legal_moves) <= FORCED_MOVES and
+                ply + depth < 2 * self._root_depth):
+            deeper = depth
+        reduce = self.reductions and alphabeta and depth >= LMR_DEPTH
+        if self.ordering:
+            first = self._pv_move if not ply and tt_move is None else tt_move
+            self.order_moves(legal_moves, first, ply, maximise)
+        elif tt_move is not None and tt_move in legal_moves:
+            # Search the best move found for this position last time first
+            legal_moves.remove(tt_move)
+            legal_moves.insert(0, tt_move)
+        for index, move in enumerate(legal_moves):
+            if self.in_place:
+                game.push_move(move)
+                child = game
+            else:
+                child = game.forecast_move(move)
+            # Principal variation search: after the first child, test each
+            # move with a null window just above the best score so far (below
+            # it on minimising layers), and only search moves that pass that
+            # test with the full window
+            probe = pvs and index and (alpha if maximise else -beta) != float('-inf')
+            try:
+                # Late move reduction: a late move that fails to beat the best
+                # score so far at a reduced depth is not searched any deeper
+                reduced = reduce and index >= LMR_MOVES
+                if reduced:
+                    score, _ = self._minimax_alphabeta(child, deeper - 1, max_or_min,
+                                                       True, alpha, beta, pvs)
+                    reduced = score <= alpha if maximise else score >= beta
+                if not reduced:
+                    if probe:
+                        window = ((alpha, min(alpha + NULL_WINDOW, beta)) if maximise
+                                  else (max(beta - NULL_WINDOW, alpha), beta))
+                        score, _ = self._minimax_alphabeta(child, deeper, max_or_min,
+                                                           True, *window, pvs=True)
+                    if not probe or alpha < score < beta:
+                        args = (child, deeper, max_or_min, alphabeta)
+                        if alphabeta:
+                            args += (alpha, beta, pvs)
+                        score, _ = self._minimax_alphabeta(*args)
+            finally:
+                if self.in_place:
+                    game.pop_move()
+
+            # Take the first move even if it scores no better than the
+            # initial bound, so a lost position still returns a legal move
             cmp = score > v if maximise else score < v
-            if cmp:
+            if cmp or best is None:
                 v, best = score, move
 
             if alphabeta:
                 cmp = v >= beta if maximise else v <= alpha
-                if cmp: break
+                if cmp:
+                    self.record_cutoff(move, index, ply, depth, maximise)
+                    break
                 alpha, beta = ((max(alpha, v), beta) if maximise else
                                (alpha,  min(beta, v)))
 
+        if self.tt is not None:
+            if not alphabeta or alpha0 < v < beta0:
+                bound = EXACT
+            else:
+                bound = UPPER if v <= alpha0 else LOWER
+            self.tt.store(key, depth, v, bound, best)
+
         return v, best
 
     def minimax(self, game, depth, maximizing_player=True):
@@ -280,6 +1301,8 @@ class CustomPlayer:
                 each helper function or else your agent will timeout during
                 testing.
         """
+        self._root_ply = game.move_count
+        self._root_depth = depth
         return self._minimax_alphabeta(game, depth, maximizing_player)
 
     def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf"), maximizing_player=True):
@@ -325,5 +1348,68 @@ class CustomPlayer:
                 each helper function or else your agent will timeout during
                 testing.
         """
+        self._root_ply = game.move_count
+        self._root_depth = depth
         return self._minimax_alphabeta(game, depth, maximizing_player, True,
-                                                                    alpha, beta)
\ No newline at end of file
+                                                                    alpha, beta)
+
+    def pvs(self, game, depth, alpha=float("-inf"), beta=float("inf"), maximizing_player=True):
+        """Implement principal variation search (NegaScout): alpha-beta that
+        searches the first move at each node with the full window, and the
+        remaining moves with a null window that only tests whether they beat
+        the first, re-searching those that do.
+
+        Parameters and return values are the same as for alphabeta().
+        """
+        self._root_ply = game.move_count
+        self._root_depth = depth
+        return self._minimax_alphabeta(game, depth, maximizing_player, True,
+                                       alpha, beta, True)
+
+    def mtdf(self, game, depth, guess=0., maximizing_player=True):
+        """Implement the MTD(f) search driver: converge on the minimax value
+        of the position with a sequence of null-window alpha-beta searches,
+        each one narrowing the bounds on the value, starting from a guess.
+        The transposition table lets each pass reuse the work of the passes
+        before it.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            An instance of the Isolation game `Board` class representing the
+            current game state
+
+        depth : int
+            Depth is an integer representing the maximum number of plies to
+            search in the game tree before aborting
+
+        guess : float
+            First estimate of the score, e.g. from the previous iteration
+
+        maximizing_player : bool
+            Flag indicating whether the current search depth corresponds to a
+            maximizing layer (True) or a minimizing layer (False)
+
+        Returns
+        -------
+        float
+            The score for the current search branch
+
+        tuple(int, int)
+            The best move for the current branch; (-1, -1) for no legal moves
+        """
+        self._root_ply = game.move_count
+        self._root_depth = depth
+        score, lower, upper = guess, float('-inf'), float('inf')
+        best = move = None
+        while lower < upper:
+            beta = score + NULL_WINDOW if score == lower else score
+            score, move = self._minimax_alphabeta(game, depth, maximizing_player,
+                                                  True, beta - NULL_WINDOW, beta)
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+                # Only a search that fails high has proved its move is best
+                best = move
+        return score, move if best is None else best
@@ -6,15 +6,205 @@ like knights in chess rather than queens.
 You MAY use and modify this class, however ALL function signatures must
 remain compatible with the defaults provided, and none of your changes will
 be available to project reviewers.
+
+Internally the board is a bitboard: every cell has an integer index
+(``row + col * height``, so cells are numbered down each column in the same
+order that `get_blank_spaces` has always listed them) and the set of blocked
+cells is a single Python int with bit ``1 << index`` set for each occupied
+cell. Player locations are stored as cell indices in a two-element tuple
+indexed by player slot (0 for player 1, 1 for player 2). All of the position
+state is immutable, so `Board.copy()` shares it with the original and moves
+replace it rather than modifying it. Neighbour lookups
+come from a `MoveTable`, built once per board geometry by `move_table()`.
 """
+import multiprocessing
 import random
+import sys
+import threading
 import timeit
 
-from copy import deepcopy
-from copy import copy
+from collections import namedtuple
 
 TIME_LIMIT_MILLIS = 200
 
+# Extra time (in milliseconds) a watchdog allows past the time limit before
+# it abandons a player's move and declares a timeout
+WATCHDOG_GRACE_MILLIS = 50
+
+# One entry of the per-ply telemetry optionally recorded by `Board.play()`.
+# `time_used` and `time_left` are in milliseconds; `stats` holds whatever
+# search statistics the agent exposed after the move (see `agent_stats`).
+PlyRecord = namedtuple("PlyRecord", ["ply", "player", "move", "legal_moves",
+                                     "time_used", "time_left", "stats"])
+
+# Knight move offsets as (row, column) deltas
+DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+              (1, -2), (1, 2), (2, -1), (2, 1)]
+
+# Offsets of the eight cells surrounding a cell
+ADJACENT = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+            (0, 1), (1, -1), (1, 0), (1, 1)]
+
+_MOVE_TABLES = {}
+
+
+class MoveTable(object):
+    """Precomputed neighbour lookups for every cell of a board geometry.
+
+    Cells are addressed by their bitboard index, ``row + col * height``.
+
+    Attributes
+    ----------
+    coords : list<(int, int)>
+        The (row, column) pair of each cell index.
+
+    knight_cells : list<tuple<int>>
+        The on-board cells a knight can reach from each cell, in the order
+        of `DIRECTIONS`.
+
+    knight_masks : list<int>
+        `knight_cells` for each cell as a bitmask.
+
+    adjacent_cells, adjacent_masks : list
+        As above, for the (up to) eight surrounding cells.
+
+    full_mask : int
+        A bitmask with the bit of every cell on the board set.
+
+    zobrist_blocked, zobrist_location, zobrist_side : list<int>, int
+        64-bit Zobrist keys for a blocked cell, for each player slot standing
+        on a cell (``zobrist_location[slot][idx]``) and for player 2 holding
+        the initiative. The keys are seeded by the geometry, so every board of
+        the same size hashes positions identically.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.coords = [(idx % height, idx // height)
+                       for idx in range(width * height)]
+        self.knight_cells = [self._neighbours(r, c, DIRECTIONS)
+                             for r, c in self.coords]
+        self.knight_masks = [self._to_mask(cells) for cells in self.knight_cells]
+        self.adjacent_cells = [self._neighbours(r, c, ADJACENT)
+                               for r, c in self.coords]
+        self.adjacent_masks = [self._to_mask(cells)
+                               for cells in self.adjacent_cells]
+        self.full_mask = (1 << (width * height)) - 1
+
+        rng = random.Random('{}x{}'.format(width, height))
+        self.zobrist_blocked = [rng.getrandbits(64) for _ in self.coords]
+        self.zobrist_location = [[rng.getrandbits(64) for _ in self.coords]
+                                 for _ in range(2)]
+        self.zobrist_side = rng.getrandbits(64)
+
+    def _neighbours(self, r, c, offsets):
+        return tuple(r + dr + (c + dc) * self.height for dr, dc in offsets
+                     if 0 <= r + dr < self.height and 0 <= c + dc < self.width)
+
+    @staticmethod
+    def _to_mask(cells):
+        mask = 0
+        for idx in cells:
+            mask |= 1 << idx
+        return mask
+
+
+def move_table(width, height):
+    """Return the shared `MoveTable` for a board geometry, building it on
+    first use.
+    """
+    table = _MOVE_TABLES.get((width, height))
+    if table is None:
+        table = _MOVE_TABLES[(width, height)] = MoveTable(width, height)
+    return table
+
+
+def agent_stats(player):
+    """Return a dict of the search statistics a player exposes through a
+    `search_stats` attribute, or an empty dict if it has none. The attribute
+    may be a mapping or an object with an `as_dict()` method.
+    """
+    stats = getattr(player, 'search_stats', None)
+    if stats is None:
+        return {}
+    if hasattr(stats, 'as_dict'):
+        return stats.as_dict()
+    return dict(stats)
+
+
+def _move_in_thread(player, game, legal_moves, time_left, deadline):
+    """Run `player.get_move` in a daemon thread, waiting at most `deadline`
+    seconds. Returns (move, stats); a thread that overruns is left to finish
+    in the background and its move is discarded.
+
+    A thread cannot be stopped, so this only records the forfeit: an agent
+    that never returns keeps running (and holding the GIL, and changing its
+    player object) for the rest of the process. Use `_move_in_process` to
+    bound the cost of such agents.
+    """
+    result = []
+
+    def run():
+        try:
+            result.append((player.get_move(game, legal_moves, time_left), None))
+        except BaseException:
+            result.append((None, sys.exc_info()[1]))
+
+    worker = threading.Thread(target=run)
+    worker.daemon = True
+    worker.start()
+    worker.join(deadline)
+    if not result:
+        return Board.NOT_MOVED, agent_stats(player)
+    move, error = result[0]
+    if error is not None:
+        raise error
+    return move, agent_stats(player)
+
+
+def _move_in_child(conn, player, game, legal_moves, time_left):
+    try:
+        move = player.get_move(game, legal_moves, time_left)
+        conn.send((move, agent_stats(player), None))
+    except BaseException as error:
+        conn.send((None, {}, repr(error)))
+    finally:
+        conn.close()
+
+
+def _move_in_process(player, game, legal_moves, time_left, deadline):
+    """Run `player.get_move` in a forked child process, killing it if it
+    has not answered within `deadline` seconds. Returns (move, stats). Any
+    state the player changes during the move stays in the child, although
+    its `search_stats` are sent back with the move.
+    """
+    context = multiprocessing.get_context('fork')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    child = context.Process(target=_move_in_child,
+                            args=(child_conn, player, game, legal_moves, time_left))
+    child.daemon = True
+    child.start()
+    child_conn.close()
+    try:
+        if not parent_conn.poll(deadline):
+            child.kill()
+            return Board.NOT_MOVED, {}
+        try:
+            move, stats, error = parent_conn.recv()
+        except EOFError:
+            # The child died before it could answer
+            return Board.NOT_MOVED, {}
+    finally:
+        parent_conn.close()
+        child.join()
+    if error is not None:
+        raise RuntimeError("get_move() failed in watchdog process: " + error)
+    return move, stats
+
+
+_WATCHDOGS = {'thread': _move_in_thread, 'process': _move_in_process}
+
 
 class Board(object):
     """Implement a model for the game Isolation assuming each player moves like
@@ -35,35 +225,57 @@ class Board(object):
 
     height : int (optional)
         The number of rows that the board should have.
+
+    seed : hashable (optional)
+        Seed for a random number generator private to this board (and its
+        copies) used to shuffle legal move lists. If None, the module-level
+        `random` generator is used.
+
+    shuffle : bool (optional)
+        Flag indicating whether `get_legal_moves` returns moves in random
+        order (True) or in the fixed order of the board's move table (False).
+        Move counts and terminal tests never shuffle, whatever the mode.
     """
     BLANK = 0
     NOT_MOVED = None
 
-    def __init__(self, player_1, player_2, width=7, height=7):
+    __slots__ = ('width', 'height', 'move_count', 'move_table', '_players',
+                 '_active', '_blocked', '_locs', '_hash', '_undo', '_shuffle',
+                 '_move_cache')
+
+    def __init__(self, player_1, player_2, width=7, height=7, seed=None,
+                 shuffle=True):
         self.width = width
         self.height = height
         self.move_count = 0
-        self.__player_1__ = player_1
-        self.__player_2__ = player_2
-        self.__active_player__ = player_1
-        self.__inactive_player__ = player_2
-        self.__board_state__ = [[Board.BLANK for i in range(width)] for j in range(height)]
-        self.__last_player_move__ = {player_1: Board.NOT_MOVED, player_2: Board.NOT_MOVED}
-        self.__player_symbols__ = {Board.BLANK: Board.BLANK, player_1: 1, player_2: 2}
+        self.move_table = move_table(width, height)
+        self._players = (player_1, player_2)
+        self._active = 0
+        self._blocked = 0
+        self._locs = (None, None)
+        self._hash = 0
+        self._undo = None
+        self._move_cache = None
+        if not shuffle:
+            self._shuffle = None
+        elif seed is None:
+            self._shuffle = random.shuffle
+        else:
+            self._shuffle = random.Random(seed).shuffle
 
     @property
     def active_player(self):
         """The object registered as the player holding initiative in the
         current game state.
         """
-        return self.__active_player__
+        return self._players[self._active]
 
     @property
     def inactive_player(self):
         """The object registered as the player in waiting for the current
         game state.
         """
-        return self.__inactive_player__
+        return self._players[1 - self._active]
 
     def get_opponent(self, player):
         """Return the opponent of the supplied player.
@@ -80,21 +292,41 @@ class Board(object):
         object
             The opponent of the input player object.
         """
-        if player == self.__active_player__:
-            return self.__inactive_player__
-        elif player == self.__inactive_player__:
-            return self.__active_player__
+        if player == self.active_player:
+            return self.inactive_player
+        elif player == self.inactive_player:
+            return self.active_player
         raise RuntimeError("`player` must be an object registered as a player in the current game.")
 
     def copy(self):
         """ Return a deep copy of the current board. """
-        new_board = Board(self.__player_1__, self.__player_2__, width=self.width, height=self.height)
+        # The position state is immutable, so the copy can share it
+        new_board = Board.__new__(Board)
+        new_board.width = self.width
+        new_board.height = self.height
         new_board.move_count = self.move_count
-        new_board.__active_player__ = self.__active_player__
-        new_board.__inactive_player__ = self.__inactive_player__
-        new_board.__last_player_move__ = copy(self.__last_player_move__)
-        new_board.__player_symbols__ = copy(self.__player_symbols__)
-        new_board.__board_state__ = deepcopy(self.__board_state__)
+        new_board.move_table = self.move_table
+        new_board._players = self._players
+        new_board._active = self._active
+        new_board._blocked = self._blocked
+        new_board._locs = self._locs
+        new_board._hash = self._hash
+        new_board._undo = None
+        new_board._shuffle = self._shuffle
+        # Both boards hold the same position until one of them moves, and a
+        # move replaces the cache rather than clearing it in place, so the
+        # copy can share (and help fill) the original's move cache
+        new_board._move_cache = self._move_cache
+        return new_board
+
+    def with_players(self, player_1, player_2):
+        """Return a copy of the board with `player_1` and `player_2` in the
+        places of its players; for example, to send a position to another
+        process without the player objects.
+        """
+        new_board = self.copy()
+        new_board._players = (player_1, player_2)
+        new_board._move_cache = None
         return new_board
 
     def forecast_move(self, move):
@@ -133,13 +365,20 @@ class Board(object):
         row, col = move
         return 0 <= row < self.height and \
                0 <= col < self.width and \
-               self.__board_state__[row][col] == Board.BLANK
+               not self._blocked >> (row + col * self.height) & 1
 
     def get_blank_spaces(self):
         """Return a list of the locations that are still available on the board.
         """
-        return [(i, j) for j in range(self.width) for i in range(self.height)
-            if self.__board_state__[i][j] == Board.BLANK]
+        blocked = self._blocked
+        return [coord for idx, coord in enumerate(self.move_table.coords)
+                if not blocked >> idx & 1]
+
+    def get_blank_mask(self):
+        """Return a bitmask with the bit of every open cell set. See
+        `MoveTable` for the cell numbering.
+        """
+        return self.move_table.full_mask & ~self._blocked
 
     def get_player_location(self, player):
         """Find the current location of the specified player on the board.
@@ -155,7 +394,13 @@ class Board(object):
             The coordinate pair (row, column) of the input player, or None
             if the player has not moved.
         """
-        return self.__last_player_move__[player]
+        return self._cell_to_coord(self._locs[self._slot(player)])
+
+    def get_player_cell(self, player):
+        """Return the cell index of the specified player, or None if the
+        player has not moved. See `MoveTable` for the cell numbering.
+        """
+        return self._locs[self._slot(player)]
 
     def get_legal_moves(self, player=None):
         """Return the list of all legal moves for the specified player.
@@ -172,9 +417,32 @@ class Board(object):
             The list of coordinate pairs (row, column) of all legal moves
             for the player constrained by the current game state.
         """
-        if player is None:
-            player = self.active_player
-        return self.__get_moves__(self.__last_player_move__[player])
+        # Move lists are generated once per player per position and cached
+        # until the next move; each call returns its own (shuffled) copy
+        slot = self._active if player is None else self._slot(player)
+        cache = self._move_cache
+        if cache is None:
+            cache = self._move_cache = [None, None]
+        moves = cache[slot]
+        if moves is None:
+            moves = cache[slot] = tuple(self._moves_from(self._locs[slot]))
+        moves = list(moves)
+        if self._shuffle is not None:
+            self._shuffle(moves)
+        return moves
+
+    def count_legal_moves(self, player=None):
+        """Return the number of legal moves for the specified player (the
+        active player if None). Equivalent to ``len(get_legal_moves())``, but
+        counts bits in the move table instead of building a shuffled list.
+        """
+        slot = self._active if player is None else self._slot(player)
+        if self._move_cache is not None and self._move_cache[slot] is not None:
+            return len(self._move_cache[slot])
+        idx = self._locs[slot]
+        if idx is None:
+            return bin(self.get_blank_mask()).count('1')
+        return bin(self.move_table.knight_masks[idx] & ~self._blocked).count('1')
 
     def apply_move(self, move):
         """Move the active player to a specified location.
@@ -190,19 +458,71 @@ class Board(object):
         None
         """
         row, col = move
-        self.__last_player_move__[self.active_player] = move
-        self.__board_state__[row][col] = self.__player_symbols__[self.active_player]
-        players = (self.__inactive_player__, self.__active_player__)
-        self.__active_player__, self.__inactive_player__ = players
+        idx = row + col * self.height
+        table = self.move_table
+        location_keys = table.zobrist_location[self._active]
+        prev = self._locs[self._active]
+        key = table.zobrist_side ^ location_keys[idx]
+        if prev is not None:
+            key ^= location_keys[prev]
+        if not self._blocked >> idx & 1:
+            key ^= table.zobrist_blocked[idx]
+        self._hash ^= key
+        locs = self._locs
+        self._locs = (idx, locs[1]) if self._active == 0 else (locs[0], idx)
+        self._blocked |= 1 << idx
+        self._active = 1 - self._active
+        self._move_cache = None
         self.move_count += 1
 
+    def hash_key(self):
+        """Return a 64-bit Zobrist key for the current position.
+
+        The key covers the blocked cells, both player locations and which
+        player holds the initiative, and is updated incrementally as moves
+        are applied and undone, so reading it costs O(1).
+        """
+        return self._hash
+
+    def push_move(self, move):
+        """Apply a move in place, recording enough state for `pop_move` to
+        restore the current position. Used by search code that walks the game
+        tree on a single board instead of copying it with `forecast_move`.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+
+        Returns
+        ----------
+        None
+        """
+        if self._undo is None:
+            self._undo = []
+        self._undo.append((self._blocked, self._locs, self._hash,
+                           self._move_cache))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Undo the most recent move applied with `push_move`.
+
+        Returns
+        ----------
+        None
+        """
+        self._blocked, self._locs, self._hash, self._move_cache = self._undo.pop()
+        self._active = 1 - self._active
+        self.move_count -= 1
+
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
-        return player == self.inactive_player and not self.get_legal_moves(self.active_player)
+        return player == self.inactive_player and not self._has_moves()
 
     def is_loser(self, player):
         """ Test whether the specified player has lost the game. """
-        return player == self.active_player and not self.get_legal_moves(self.active_player)
+        return player == self.active_player and not self._has_moves()
 
     def utility(self, player):
         """Returns the utility of the current game state from the perspective
@@ -226,7 +546,7 @@ class Board(object):
             a value of -inf if the player has lost, and a value of 0
             otherwise.
         """
-        if not self.get_legal_moves(self.active_player):
+        if not self._has_moves():
 
             if player == self.inactive_player:
                 return float("inf")
@@ -242,15 +562,141 @@ class Board(object):
         """
         if loc == Board.NOT_MOVED:
             return self.get_blank_spaces()
-
-        r, c = loc
-        directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                      (1, -2), (1, 2), (2, -1), (2, 1)]
-        valid_moves = [(r + dr, c + dc) for dr, dc in directions
-                       if self.move_is_legal((r + dr, c + dc))]
-        random.shuffle(valid_moves)
+        valid_moves = self._moves_from(loc[0] + loc[1] * self.height)
+        if self._shuffle is not None:
+            self._shuffle(valid_moves)
         return valid_moves
 
+    def _moves_from(self, idx):
+        """Generate the list of open knight moves from a cell index, in move
+        table order, or every blank space if the index is None.
+        """
+        if idx is None:
+            return self.get_blank_spaces()
+
+        blocked, coords = self._blocked, self.move_table.coords
+        return [coords[i] for i in self.move_table.knight_cells[idx]
+                if not blocked >> i & 1]
+
+    def _has_moves(self):
+        """Test whether the active player has any legal move."""
+        cache = self._move_cache
+        if cache is not None and cache[self._active] is not None:
+            return bool(cache[self._active])
+        idx = self._locs[self._active]
+        if idx is None:
+            return self._blocked != self.move_table.full_mask
+        return bool(self.move_table.knight_masks[idx] & ~self._blocked)
+
+    def _slot(self, player):
+        """Return the slot index (0 or 1) of a registered player."""
+        if player == self._players[0]:
+            return 0
+        if player == self._players[1]:
+            return 1
+        raise RuntimeError("`player` must be an object registered as a player in the current game.")
+
+    def _cell_to_coord(self, idx):
+        """Convert a cell index into a (row, column) pair; None maps to
+        Board.NOT_MOVED.
+        """
+        if idx is None:
+            return Board.NOT_MOVED
+        return self.move_table.coords[idx]
+
+    def _reset_derived_state(self):
+        """Recompute the Zobrist key from scratch and drop cached move lists,
+        after the position has been replaced wholesale.
+        """
+        self._move_cache = None
+        table = self.move_table
+        key = table.zobrist_side if self._active else 0
+        blocked = self._blocked
+        while blocked:
+            cell = blocked & -blocked
+            blocked ^= cell
+            key ^= table.zobrist_blocked[cell.bit_length() - 1]
+        for slot, idx in enumerate(self._locs):
+            if idx is not None:
+                key ^= table.zobrist_location[slot][idx]
+        self._hash = key
+
+    # The attributes below reproduce the dictionary and nested-list state of
+    # the original implementation, so code written against it (for instance
+    # `agent_test.CounterBoard.copy()`) keeps working on top of the bitboard.
+
+    @property
+    def __player_1__(self):
+        return self._players[0]
+
+    @property
+    def __player_2__(self):
+        return self._players[1]
+
+    @property
+    def __active_player__(self):
+        return self.active_player
+
+    @__active_player__.setter
+    def __active_player__(self, player):
+        self._active = self._slot(player)
+        self._reset_derived_state()
+
+    @property
+    def __inactive_player__(self):
+        return self.inactive_player
+
+    @__inactive_player__.setter
+    def __inactive_player__(self, player):
+        self._active = 1 - self._slot(player)
+        self._reset_derived_state()
+
+    @property
+    def __last_player_move__(self):
+        return {player: self._cell_to_coord(idx)
+                for player, idx in zip(self._players, self._locs)}
+
+    @__last_player_move__.setter
+    def __last_player_move__(self, locations):
+        self._locs = tuple(None if locations[player] is None else
+                           locations[player][0] + locations[player][1] * self.height
+                           for player in self._players)
+        self._reset_derived_state()
+
+    @property
+    def __player_symbols__(self):
+        return {Board.BLANK: Board.BLANK, self._players[0]: 1, self._players[1]: 2}
+
+    @__player_symbols__.setter
+    def __player_symbols__(self, symbols):
+        pass  # symbols are fixed by player slot
+
+    @property
+    def __board_state__(self):
+        # The bitboard only records whether a cell is blocked, so cells are
+        # marked with the symbol of the player standing on them, or 1 for a
+        # cell that was vacated earlier in the game.
+        state = [[Board.BLANK] * self.width for _ in range(self.height)]
+        blocked = self._blocked
+        while blocked:
+            cell = blocked & -blocked
+            blocked ^= cell
+            idx = cell.bit_length() - 1
+            state[idx % self.height][idx // self.height] = 1
+        if self._locs[1] is not None:
+            state[self._locs[1] % self.height][self._locs[1] // self.height] = 2
+        return state
+
+    @__board_state__.setter
+    def __board_state__(self, state):
+        blocked = 0
+        for row, cells in enumerate(state):
+            for col, cell in enumerate(cells):
+                if cell != Board.BLANK:
+                    blocked |= 1 << (row + col * self.height)
+        self._blocked = blocked
+        self._reset_derived_state()
+
     def print_board(self):
         """DEPRECATED - use Board.to_string()"""
         return self.to_string()
@@ -260,8 +706,8 @@ class Board(object):
         the location of each player and indicating which cells have been
         blocked, and which remain open.
         """
-        p1_loc = self.__last_player_move__[self.__player_1__]
-        p2_loc = self.__last_player_move__[self.__player_2__]
+        p1_loc = self._locs[0]
+        p2_loc = self._locs[1]
 
         out = ''
 
@@ -269,12 +715,13 @@ class Board(object):
             out += ' | '
 
             for j in range(self.width):
+                idx = i + j * self.height
 
-                if not self.__board_state__[i][j]:
+                if not self._blocked >> idx & 1:
                     out += ' '
-                elif p1_loc and i == p1_loc[0] and j == p1_loc[1]:
+                elif idx == p1_loc:
                     out += symbols[0]
-                elif p2_loc and i == p2_loc[0] and j == p2_loc[1]:
+                elif idx == p2_loc:
                     out += symbols[1]
                 else:
                     out += '-'
@@ -283,7 +730,8 @@ class Board(object):
 
         return out
 
-    def play(self, time_limit=TIME_LIMIT_MILLIS):
+    def play(self, time_limit=TIME_LIMIT_MILLIS, telemetry=None, watchdog=None,
+             grace=WATCHDOG_GRACE_MILLIS):
         """Execute a match between the players by alternately soliciting them
         to select a move and applying it in the game.
 
@@ -293,6 +741,25 @@ class Board(object):
             The maximum number of milliseconds to allow before timeout
             during each turn.
 
+        telemetry : list or callable (optional)
+            If given, a `PlyRecord` is produced for every move solicited from
+            a player (including a final timed-out or illegal move) and either
+            appended to the list or passed to the callable.
+
+        watchdog : {None, 'thread', 'process'} (optional)
+            Forfeit a player by timeout as soon as `time_limit + grace`
+            milliseconds have passed, instead of only checking the time once
+            `get_move` returns. Only 'process' enforces the limit: each move
+            runs in a forked child process, which is killed if it overruns
+            (or forfeits if it dies), and players lose any state they change
+            during a move. 'thread' runs each move in a daemon thread and
+            only records the forfeit: an overrunning thread cannot be
+            stopped, so it keeps running, competing with later moves for the
+            interpreter and changing its player, until it returns.
+
+        grace : numeric (optional)
+            Milliseconds the watchdog allows past `time_limit`.
+
         Returns
         ----------
         (player, list<[(int, int),]>, str)
@@ -304,6 +771,13 @@ class Board(object):
 
         time_millis = lambda: 1000 * timeit.default_timer()
 
+        if telemetry is not None and not callable(telemetry):
+            telemetry = telemetry.append
+
+        if watchdog is not None:
+            run_move = _WATCHDOGS[watchdog]
+            deadline = (time_limit + grace) / 1000.
+
         while True:
 
             legal_player_moves = self.get_legal_moves()
@@ -311,21 +785,34 @@ class Board(object):
 
             move_start = time_millis()
             time_left = lambda : time_limit - (time_millis() - move_start)
-            curr_move = self.active_player.get_move(game_copy, legal_player_moves, time_left)
+            if watchdog is None:
+                curr_move = self.active_player.get_move(game_copy, legal_player_moves, time_left)
+                stats = None
+            else:
+                curr_move, stats = run_move(self.active_player, game_copy,
+                                               legal_player_moves, time_left,
+                                               deadline)
             move_end = time_left()
 
             if curr_move is None:
                 curr_move = Board.NOT_MOVED
 
+            if telemetry is not None:
+                telemetry(PlyRecord(self.move_count, self.active_player,
+                                    curr_move, len(legal_player_moves),
+                                    time_limit - move_end, move_end,
+                                    agent_stats(self.active_player)
+                                    if stats is None else stats))
+
             if self.active_player == self.__player_1__:
                 move_history.append([curr_move])
             else:
                 move_history[-1].append(curr_move)
 
             if move_end < 0:
-                return self.__inactive_player__, move_history, "timeout"
+                return self.inactive_player, move_history, "timeout"
 
             if curr_move not in legal_player_moves:
-                return self.__inactive_player__, move_history, "illegal move"
+                return self.inactive_player, move_history, "illegal move"
 
             self.apply_move(curr_move)
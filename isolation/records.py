@@ -0,0 +1,174 @@
+"""
+This file contains a compact binary format for archiving finished games of
+Isolation, with an append-only writer and a memory-mapped reader.
+
+An archive starts with an 8 byte file header (the magic string ``ISOG``, a
+format version byte and three reserved bytes) followed by any number of game
+records. Each record is a fixed-size header
+
+    width, height, winner, termination : uint8
+    time_limit                         : uint16, milliseconds
+    duration                           : float32, milliseconds
+    len(name_1), len(name_2)           : uint8
+    len(moves)                         : uint16
+
+followed by the two UTF-8 player names and one byte per move. A move is
+stored as its cell index on the board (``row + col * height``, the numbering
+used by `isolation.Board`), with `NO_MOVE` for a player that returned None
+and `OFF_BOARD` for any other move that is not a cell of the board. The
+winner is the player slot (0 for the player who moved first, 1 for the
+other) or `NO_WINNER`.
+
+All integers are little-endian. Boards may have at most 254 cells.
+"""
+import mmap
+import os
+import struct
+
+from collections import namedtuple
+
+MAGIC = b'ISOG'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sB3x')
+RECORD_HEADER = struct.Struct('<BBBBHfBBH')
+
+NO_MOVE = 0xFF
+OFF_BOARD = 0xFE
+NO_WINNER = 0xFF
+
+# Termination reasons are stored as an index into this tuple
+TERMINATIONS = ('', 'timeout', 'illegal move')
+
+# A finished game. `moves` lists every move from the empty board onwards,
+# starting with the first player's, as (row, col) pairs or None. `winner` is
+# the slot (0 or 1) of the winning player, or None.
+GameRecord = namedtuple("GameRecord", ["width", "height", "players", "winner",
+                                       "termination", "time_limit",
+                                       "duration", "moves"])
+
+
+def encode_move(move, width, height):
+    """Return the byte used to store a (row, col) move on a board."""
+    if move is None:
+        return NO_MOVE
+    row, col = move
+    if 0 <= row < height and 0 <= col < width:
+        return row + col * height
+    return OFF_BOARD
+
+
+def decode_move(cell, width, height):
+    """Return the (row, col) move stored as a byte. Moves that were off the
+    board are decoded as (-1, -1).
+    """
+    if cell == NO_MOVE:
+        return None
+    if cell == OFF_BOARD:
+        return (-1, -1)
+    return (cell % height, cell // height)
+
+
+class GameRecordWriter(object):
+    """Append game records to an archive file, creating it if necessary.
+
+    Parameters
+    ----------
+    path : str
+        The archive to append to.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record):
+        """Append a `GameRecord` to the archive."""
+        width, height = record.width, record.height
+        if width * height >= OFF_BOARD:
+            raise ValueError("Boards with more than {} cells cannot be archived."
+                             .format(OFF_BOARD - 1))
+        # Names are cut to 255 bytes, without splitting a character
+        names = [str(name).encode('utf-8')[:255].decode('utf-8', 'ignore')
+                 .encode('utf-8') for name in record.players]
+        winner = NO_WINNER if record.winner is None else record.winner
+        header = RECORD_HEADER.pack(width, height, winner,
+                                    TERMINATIONS.index(record.termination),
+                                    record.time_limit, record.duration,
+                                    len(names[0]), len(names[1]),
+                                    len(record.moves))
+        moves = bytes(encode_move(move, width, height) for move in record.moves)
+        self._file.write(header + names[0] + names[1] + moves)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class GameRecordReader(object):
+    """Iterate over the game records in an archive without loading it into
+    memory. The file is memory-mapped and each `GameRecord` is decoded as the
+    iteration reaches it. A record truncated by an interrupted write at the
+    end of the file is ignored.
+
+    Parameters
+    ----------
+    path : str
+        The archive to read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = None
+        if os.fstat(self._file.fileno()).st_size == 0:
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < FILE_HEADER.size:
+            raise ValueError("{} is not a game archive.".format(path))
+        magic, version = FILE_HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a version {} game archive."
+                             .format(path, VERSION))
+
+    def __iter__(self):
+        data = self._map
+        if data is None:
+            return
+        offset, end = FILE_HEADER.size, len(data)
+        while offset + RECORD_HEADER.size <= end:
+            (width, height, winner, termination, time_limit, duration,
+             name_1, name_2, num_moves) = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            if offset + name_1 + name_2 + num_moves > end:
+                return
+            players = (data[offset:offset + name_1].decode('utf-8'),
+                       data[offset + name_1:offset + name_1 + name_2].decode('utf-8'))
+            offset += name_1 + name_2
+            moves = [decode_move(cell, width, height)
+                     for cell in data[offset:offset + num_moves]]
+            offset += num_moves
+            yield GameRecord(width, height, players,
+                             None if winner == NO_WINNER else winner,
+                             TERMINATIONS[termination], time_limit, duration,
+                             moves)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
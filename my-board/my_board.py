@@ -12,19 +12,20 @@ KNIGHT_OFFSETS = [
 
 
 def board_to_coords(game):
-    # Convert representation of AIND Isolation board to ours
+    # Convert representation of AIND Isolation board to ours: the locations
+    # of player 1 and player 2 (None if not yet placed), followed by the
+    # other blocked cells, with all co-ords translated so that the centre of
+    # the (square) board is (0, 0)
+    offset = game.height // 2
+    centre = lambda x:None if x is None else (x[0]-offset, x[1]-offset)
 
-    # Add an offset so centre of board always (0, 0)?
-    # And then you'd have to add the offset back to your numeric encoding.
-    coords = [game.__last_player_move[game.__player_1__],
-              game.__last_player_move[game.__player_2__]]
+    players = [game.get_player_location(game.__player_1__),
+               game.get_player_location(game.__player_2__)]
+    blank = set(game.get_blank_spaces())
+    blocked = [(r, c) for r in range(game.height) for c in range(game.width)
+               if (r, c) not in blank and (r, c) not in players]
 
-    for r, row in enumerate(self.__board_state__):
-        for c, col in enumerate(row):
-            if col != BLANK:
-                coords.append((r, c))
-
-    return coords
+    return [centre(p) for p in players] + sorted(centre(b) for b in blocked)
 
 
 class MyBoard(object):
@@ -67,8 +68,9 @@ class MyBoard(object):
         return self.enc.coords_to_integer(self.current)
 
     def normalise(self):
-        # Enumerate all the rotations and flips of this board, and return the
-        # one which has the lowest encoding integer.
+        # Enumerate all the rotations and flips of this board, and transform
+        # it into the one which has the lowest encoding integer. Returns the
+        # flag of the transformation, for use with rotate().
         lowest = None
         for flag, rotated in enum_rotations(self.current):
             encoding = self.enc.coords_to_integer(rotated)
@@ -78,10 +80,11 @@ class MyBoard(object):
 
         encoding, flag, rotated = lowest
         if not flag:
-            return
+            return flag
         self.current = rotated
-        self.empty = rotate(self.empty, flag)
+        self.empty = set(rotate(self.empty, flag))
         # print('Lowest xform:', bin(flag)[2:].zfill(3))
+        return flag
 
     def copy(self):
         new_board = MyBoard()
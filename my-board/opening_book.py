@@ -0,0 +1,157 @@
+"""
+Build and use an opening book for Isolation.
+
+Every position reachable in the first few plies is searched deeply (offline,
+across a pool of processes) and the best move stored, keyed by the position's
+normalised MyBoard encoding. Positions that are rotations or reflections of
+each other share an encoding, so the book only has to search one of each,
+and a move found in the book is mapped back onto the actual board by undoing
+the transformation that normalised it.
+
+Build a book from the command line, e.g.
+
+    python opening_book.py book.json --plies 3 --depth 6 --workers 4
+
+and give it to an agent with
+
+    CustomPlayer(book=OpeningBook.load('book.json'))
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from board_rotations import rotate
+from my_board import MyBoard, board_to_coords
+
+# The isolation package and game_agent live in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_agent import CustomPlayer
+from isolation import Board
+
+
+def position_key(game):
+    # Return the normalised encoding of an Isolation Board, and the flag of
+    # the rotation/reflection that normalised it
+    board = MyBoard(game.width)
+    board.current = board_to_coords(game)
+    board.empty -= set(board.current)
+    flag = board.normalise()
+    return hash(board), flag
+
+
+def replay(moves, player_1='1', player_2='2', dim=7):
+    # Return a new Board with a sequence of moves applied to it
+    game = Board(player_1, player_2, dim, dim)
+    for move in moves:
+        game.apply_move(move)
+    return game
+
+
+def opening_positions(plies, dim=7):
+    # Yield (key, moves) pairs: a sequence of moves leading to each distinct
+    # (normalised) position with fewer than 'plies' moves played
+    seen = set()
+    frontier = [[]]
+    for _ in range(plies):
+        next_frontier = []
+        for moves in frontier:
+            game = replay(moves, dim=dim)
+            key, _ = position_key(game)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield key, moves
+            next_frontier.extend(moves + [move] for move in game.get_legal_moves())
+        frontier = next_frontier
+
+
+def analyse(args):
+    # Search a position to a fixed depth, with the searching agent to move,
+    # and return its key and best move in normalised co-ords
+    moves, depth, dim = args
+    agent = CustomPlayer(search_depth=depth, iterative=False,
+                         method='alphabeta', ordering=True, tt_megabytes=64)
+    players = (agent, 'opponent') if len(moves) % 2 == 0 else ('opponent', agent)
+    game = replay(moves, *players, dim=dim)
+    move = agent.get_move(game, game.get_legal_moves(), lambda: float('inf'))
+
+    key, flag = position_key(game)
+    offset = dim // 2
+    move = rotate([(move[0]-offset, move[1]-offset)], flag)[0]
+    return key, move
+
+
+class OpeningBook(object):
+    """Best moves for the opening positions of a dim x dim game, keyed by
+    normalised MyBoard encoding, for positions with fewer than `plies` moves
+    played. `moves` maps each key to a move in normalised, centred co-ords.
+    """
+
+    def __init__(self, dim=7, plies=0, moves=None):
+        self.dim = dim
+        self.plies = plies
+        self.moves = {} if moves is None else moves
+
+    @classmethod
+    def build(cls, plies, depth, workers=None, dim=7):
+        """Search every distinct position with fewer than `plies` moves
+        played to `depth` plies, on a pool of `workers` processes (one per
+        core by default), and return the resulting book.
+        """
+        jobs = [(moves, depth, dim) for _, moves in opening_positions(plies, dim)]
+        with multiprocessing.Pool(workers) as pool:
+            moves = dict(pool.imap_unordered(analyse, jobs))
+        return cls(dim, plies, moves)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        moves = {int(key): tuple(move) for key, move in data['moves'].items()}
+        return cls(data['dim'], data['plies'], moves)
+
+    def save(self, path):
+        data = {'dim': self.dim, 'plies': self.plies,
+                'moves': {str(key): move for key, move in self.moves.items()}}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def add(self, game, move):
+        """Record the best (row, col) move for the position of a Board."""
+        key, flag = position_key(game)
+        offset = self.dim // 2
+        self.moves[key] = rotate([(move[0]-offset, move[1]-offset)], flag)[0]
+
+    def lookup(self, game):
+        """Return the book move, as (row, col), for the position of a Board,
+        or None if the position is not in the book.
+        """
+        if (game.width, game.height) != (self.dim, self.dim) or game.move_count >= self.plies:
+            return None
+        key, flag = position_key(game)
+        move = self.moves.get(key)
+        if move is None:
+            return None
+        row, col = rotate([move], flag, reverse=True)[0]
+        offset = self.dim // 2
+        return (row + offset, col + offset)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build an Isolation opening book.")
+    parser.add_argument('path', help="file to save the book to")
+    parser.add_argument('--plies', type=int, default=2,
+                        help="number of opening plies to cover")
+    parser.add_argument('--depth', type=int, default=6,
+                        help="search depth for each position")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of processes (default: one per core)")
+    parser.add_argument('--dim', type=int, default=7, help="board size")
+    args = parser.parse_args()
+
+    book = OpeningBook.build(args.plies, args.depth, args.workers, args.dim)
+    book.save(args.path)
+    print("Saved {} positions to {}".format(len(book.moves), args.path))
@@ -2,6 +2,16 @@
 comparison with the heuristic functions given in the sample project files.
 """
 
+# longest_path() checks whether it has run out of time every CLOCK_EVERY new
+# memo entries
+CLOCK_EVERY = 64
+
+
+def popcount(mask):
+    # Number of cells set in a bitmask
+    return bin(mask).count('1')
+
+
 def weighted_moves_score(game, player):
     # See https://github.com/on2valhalla/Isola
     # (myMoves - 3*opMoves) * filledSpaces
@@ -11,54 +21,54 @@ def weighted_moves_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    blank_spaces = len(game.get_blank_spaces())
+    blank_spaces = popcount(game.get_blank_mask())
     filled_spaces = (game.width * game.height) - blank_spaces
 
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    own_moves = game.count_legal_moves(player)
+    opp_moves = game.count_legal_moves(game.get_opponent(player))
     return float((own_moves - 3*opp_moves)*filled_spaces)
 
 
-knight_offsets = [
-              (-2, -1), (-2,  1),
-    (-1, -2),                     (-1,  2),
-    ( 1, -2),                     ( 1,  2),
-              ( 2, -1), ( 2,  1)
-]
-
-adjacent_offsets = [
-    (-1, -1), (-1, 0), (-1, 1),
-    ( 0, -1),          ( 0, 1),
-    ( 1, -1), ( 1, 0), ( 1, 1)
-]
-
-def get_moves(game, move, directions):
-    r, c = move
-    valid_moves = [(r+dr,c+dc) for dr, dc in directions]
-    valid_moves = filter(game.move_is_legal, valid_moves)
-    return valid_moves
-
-
-def find_connected(game, player, direction):
-    # Return a list of all the cells 'connected' to the player's current move.
-    # The definition of connected depends on the way the player is allowed to
-    # move from the current position, which is defined by 'directions' - a list
-    # of offsets from the player's current position.
-    examined = set([])
-    queue = set([game.get_player_location(player)])
-    while queue:
-        move = queue.pop()
-        queue |= (set(get_moves(game, move, direction)) - examined)
-        examined.add(move)
+def find_connected_mask(game, player, neighbour_masks):
+    # Return a bitmask of all the cells 'connected' to the player's current
+    # move, including the player's own cell. The definition of connected
+    # depends on the way the player is allowed to move from a cell, which is
+    # defined by 'neighbour_masks' - one of the per-cell lookups from the
+    # board's MoveTable.
+    open_cells = game.get_blank_mask()
+    start = game.get_player_cell(player)
+    if start is None:
+        return open_cells
+
+    return flood_fill(start, open_cells, neighbour_masks)
+
+
+def flood_fill(start, open_cells, neighbour_masks):
+    # Bitmask of cell 'start' and every cell of the bitmask 'open_cells'
+    # that can be reached from it through other open cells
+    examined = frontier = 1 << start
+    while frontier:
+        cell = frontier & -frontier
+        frontier ^= cell
+        new = neighbour_masks[cell.bit_length() - 1] & open_cells & ~examined
+        examined |= new
+        frontier |= new
     return examined
 
 
+def find_connected(game, player, neighbour_masks):
+    # As find_connected_mask, but return the set of (row, col) cells
+    mask = find_connected_mask(game, player, neighbour_masks)
+    coords = game.move_table.coords
+    return set(coords[idx] for idx in range(len(coords)) if mask >> idx & 1)
+
+
 def reachable(game, player):
-    return find_connected(game, player, knight_offsets)
+    return find_connected(game, player, game.move_table.knight_masks)
 
 
 def adjacent(game, player):
-    return find_connected(game, player, adjacent_offsets)
+    return find_connected(game, player, game.move_table.adjacent_masks)
 
 
 def reachable_score(game, player):
@@ -67,9 +77,11 @@ def reachable_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    own_reachable = reachable(game, player)
-    opp_reachable = reachable(game, game.get_opponent(player))
-    return float(len(own_reachable) - len(opp_reachable))
+    knight_masks = game.move_table.knight_masks
+    own_reachable = find_connected_mask(game, player, knight_masks)
+    opp_reachable = find_connected_mask(game, game.get_opponent(player),
+                                        knight_masks)
+    return float(popcount(own_reachable) - popcount(opp_reachable))
 
 
 def cut_off_reach_score(game, player):
@@ -89,14 +101,81 @@ def cut_off_reach_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    own_reachable = reachable(game, player)
-    opp_reachable = reachable(game, game.get_opponent(player))
+    knight_masks = game.move_table.knight_masks
+    own_reachable = find_connected_mask(game, player, knight_masks)
+    opp_reachable = find_connected_mask(game, game.get_opponent(player),
+                                        knight_masks)
     common = own_reachable & opp_reachable
 
-    own_score = own_reachable - common
-    opp_score = opp_reachable - common
-    score = len(own_score) - len(opp_score)
-    cut_off_bonus = bool(not len(common)) * (game.width*game.height)
+    own_score = own_reachable & ~common
+    opp_score = opp_reachable & ~common
+    score = popcount(own_score) - popcount(opp_score)
+    cut_off_bonus = bool(not common) * (game.width*game.height)
     cut_off_bonus *= (-1 if score < 0 else 1)
 
-    return float(score + cut_off_bonus)
\ No newline at end of file
+    return float(score + cut_off_bonus)
+
+def longest_path(cell, open_cells, knight_masks, memo, limit=None,
+                 expired=None):
+    # Return (length, first cell) of the longest knight's tour from 'cell'
+    # through the cells of the bitmask 'open_cells', with a first cell of
+    # None if there are no moves. Results are memoised in the dict 'memo',
+    # keyed by the cell and the region of open cells still reachable from it,
+    # so the same region is only solved once; the keys only mean the same
+    # thing for one board size, so a memo must not be shared between sizes.
+    # Returns None instead once 'memo' holds more than 'limit' entries, or
+    # the callable 'expired' (checked every CLOCK_EVERY entries) returns True.
+    region = flood_fill(cell, open_cells, knight_masks) & ~(1 << cell)
+    key = (cell, region)
+    if key in memo:
+        return memo[key]
+    if limit is not None and len(memo) > limit:
+        return None
+    if expired is not None and not len(memo) % CLOCK_EVERY and expired():
+        return None
+
+    best = (0, None)
+    # A path can't be longer than the region it runs through
+    most = popcount(region)
+    moves = knight_masks[cell] & region
+    while moves and best[0] < most:
+        bit = moves & -moves
+        moves ^= bit
+        step = bit.bit_length() - 1
+        path = longest_path(step, region ^ bit, knight_masks, memo, limit,
+                            expired)
+        if path is None:
+            return None
+        if path[0] + 1 > best[0]:
+            best = (path[0] + 1, step)
+    memo[key] = best
+    return best
+
+
+def separated_paths(game, memo, limit=None, expired=None):
+    # If the players can no longer reach any of the same cells, neither can
+    # block the other, and each one's future is just the longest path it can
+    # make through its own region. Return those longest paths as
+    # ((length, first cell), (length, first cell)) for the active and then
+    # the inactive player, or None if the players aren't separated or the
+    # search for a path exceeds 'limit' or runs out of time (see
+    # longest_path).
+    knight_masks = game.move_table.knight_masks
+    active, inactive = game.active_player, game.inactive_player
+    own_reachable = find_connected_mask(game, active, knight_masks)
+    opp_reachable = find_connected_mask(game, inactive, knight_masks)
+    if own_reachable & opp_reachable:
+        return None
+
+    open_cells = game.get_blank_mask()
+    paths = []
+    for player in (active, inactive):
+        cell = game.get_player_cell(player)
+        if cell is None:
+            return None
+        path = longest_path(cell, open_cells, knight_masks, memo, limit,
+                            expired)
+        if path is None:
+            return None
+        paths.append(path)
+    return tuple(paths)
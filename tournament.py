@@ -20,12 +20,15 @@ initiative in the second match with agentB at (5, 2) as player 1 and agentA at
 """
 
 import itertools
+import os
 import random
+import sys
+import timeit
 import warnings
 
 from collections import namedtuple
 
-from isolation import Board
+from isolation import Board, GameRecord, GameRecordWriter
 from sample_players import RandomPlayer
 from sample_players import null_score
 from sample_players import open_move_score
@@ -38,6 +41,13 @@ from my_heuristics import cut_off_reach_score
 
 NUM_MATCHES = 5  # number of matches against each opponent
 TIME_LIMIT = 150  # number of milliseconds before timeout
+WATCHDOG = None  # 'process' to forfeit agents as soon as they overrun ('thread' cannot stop them)
+ARCHIVE = None  # path of a binary game archive to append every game to
+SEARCH_STATS = True  # print each agent's search statistics after every round
+WORKERS = 1  # number of processes each Student agent searches with
+BOOK = None  # path of an opening book (see my-board/opening_book.py) for Student agents
+REDUCTIONS = False  # late move reductions for Student agents
+EXTENSIONS = False  # forced-move extensions for Student agents
 
 custom_heuristics = [
     ('Weighted_Moves', weighted_moves_score),
@@ -67,27 +77,119 @@ same opponents.
 Agent = namedtuple("Agent", ["player", "name"])
 
 
-def play_match(player1, player2):
+def add_search_stats(totals, records):
+    """
+    Add the search statistics from a game's `PlyRecord`s to running totals
+    per player. Moves made without a search (players that do not report
+    statistics, or with no legal moves) are skipped.
+    """
+    for record in records:
+        stats = record.stats
+        if not stats.get('iterations'):
+            continue
+        total = totals.setdefault(record.player, dict.fromkeys(
+            ('moves', 'depth', 'nodes', 'time', 'ebf', 'ebf_moves'), 0))
+        total['moves'] += 1
+        total['depth'] += stats['depth']
+        total['nodes'] += stats['nodes']
+        total['time'] += stats['time']
+        if stats['ebf']:
+            total['ebf'] += stats['ebf']
+            total['ebf_moves'] += 1
+
+
+def print_search_stats(totals, names):
+    """
+    Print the mean completed depth, nodes per second and mean effective
+    branching factor of each player in `totals`, named by `names`.
+    """
+    print("\nSearch statistics:")
+    print("----------")
+    for player, total in totals.items():
+        nps = 1000. * total['nodes'] / total['time'] if total['time'] else 0.
+        ebf = total['ebf'] / total['ebf_moves'] if total['ebf_moves'] else 0.
+        print("  {!s:<18} depth {:5.2f}  {:9.0f} nodes/s  EBF {:5.2f}  "
+              "({} moves)".format(names[player],
+                                  total['depth'] / total['moves'], nps, ebf,
+                                  total['moves']))
+
+
+def depth_speedup(args, workers, num_positions=20):
+    """
+    Print the mean depth reached by a CustomPlayer built from `args` when it
+    searches with `workers` processes, compared with a single process, from
+    the same random positions (six plies into a game) with TIME_LIMIT ms per
+    move. The single-process search uses predictive deepening so that, like
+    the parallel one, it spends most of each turn searching.
+    """
+    depths = {1: [], workers: []}
+    for _ in range(num_positions):
+        game = Board(RandomPlayer(), RandomPlayer())
+        moves = []
+        for _ in range(6):
+            moves.append(random.choice(game.get_legal_moves()))
+            game.apply_move(moves[-1])
+        if not game.get_legal_moves():
+            continue
+        for count in depths:
+            player = CustomPlayer(**dict(args, workers=count, predictive=True))
+            board = Board(player, RandomPlayer())
+            for move in moves:
+                board.apply_move(move)
+            deadline = timeit.default_timer() + TIME_LIMIT / 1000.
+            time_left = lambda: 1000 * (deadline - timeit.default_timer())
+            player.get_move(board, board.get_legal_moves(), time_left)
+            depths[count].append(player.search_stats.depth)
+
+    single = sum(depths[1]) / len(depths[1])
+    parallel = sum(depths[workers]) / len(depths[workers])
+    print("Mean search depth: {:.2f} with 1 process, {:.2f} with {} "
+          "({:+.2f} plies)".format(single, parallel, workers, parallel - single))
+
+
+def play_match(player1, player2, archive=None, names=('', ''), search_stats=None):
     """
     Play a "fair" set of matches between two agents by playing two games
     between the players, forcing each agent to play from randomly selected
     positions. This should control for differences in outcome resulting from
     advantage due to starting position on the board.
+
+    If `archive` is a `GameRecordWriter`, both games are appended to it, with
+    `names` giving the names of player1 and player2. If `search_stats` is a
+    dict, the players' search statistics are added to it (see
+    `add_search_stats`).
     """
     num_wins = {player1: 0, player2: 0}
     num_timeouts = {player1: 0, player2: 0}
     num_invalid_moves = {player1: 0, player2: 0}
     games = [Board(player1, player2), Board(player2, player1)]
 
+    opening = []
+
     # initialize both games with a random move and response
     for _ in range(2):
         move = random.choice(games[0].get_legal_moves())
         games[0].apply_move(move)
         games[1].apply_move(move)
+        opening.append(move)
 
     # play both games and tally the results
-    for game in games:
-        winner, _, termination = game.play(time_limit=TIME_LIMIT)
+    for game, players, game_names in zip(games, [(player1, player2), (player2, player1)],
+                                         [names, names[::-1]]):
+        start = timeit.default_timer()
+        telemetry = [] if search_stats is not None else None
+        winner, history, termination = game.play(time_limit=TIME_LIMIT,
+                                                 telemetry=telemetry,
+                                                 watchdog=WATCHDOG)
+        if telemetry:
+            add_search_stats(search_stats, telemetry)
+
+        if archive is not None:
+            moves = opening + [move for pair in history for move in pair]
+            duration = 1000 * (timeit.default_timer() - start)
+            archive.write(GameRecord(game.width, game.height, game_names,
+                                     players.index(winner), termination,
+                                     TIME_LIMIT, duration, moves))
 
         if player1 == winner:
             num_wins[player1] += 1
@@ -113,13 +215,14 @@ def play_match(player1, player2):
             num_wins[player2], num_timeouts[player2])
 
 
-def play_round(agents, num_matches, show_timeouts=False):
+def play_round(agents, num_matches, show_timeouts=False, archive=None):
     """
     Play one round (i.e., a single match between each pair of opponents)
     """
     agent_1 = agents[-1]
     wins = 0.
     total = 0.
+    search_stats = {} if SEARCH_STATS else None
 
     print("\nPlaying Matches:")
     print("----------")
@@ -132,9 +235,11 @@ def play_round(agents, num_matches, show_timeouts=False):
         print("  Match {}: {!s:^18} vs {!s:^18}".format(idx + 1, *names), end=' ')
 
         # Each player takes a turn going first
-        for p1, p2 in itertools.permutations((agent_1.player, agent_2.player)):
+        for (p1, n1), (p2, n2) in itertools.permutations(
+                ((agent_1.player, agent_1.name), (agent_2.player, agent_2.name))):
             for _ in range(num_matches):
-                score_1, tout_1, score_2, tout_2 = play_match(p1, p2)
+                score_1, tout_1, score_2, tout_2 = play_match(
+                    p1, p2, archive, (n1, n2), search_stats)
                 counts[p1] += score_1
                 counts[p2] += score_2
                 touts[p1] += tout_1
@@ -154,6 +259,10 @@ def play_round(agents, num_matches, show_timeouts=False):
                                               int(counts[agent_2.player]),
                                              ))
 
+    if search_stats:
+        print_search_stats(search_stats,
+                           {agent.player: agent.name for agent in agents})
+
     return 100. * wins / total
 
 
@@ -165,7 +274,13 @@ def main(test_all=True):
                   ("Center", center_score)]
     AB_ARGS = {"search_depth": 5, "method": 'alphabeta', "iterative": False}
     MM_ARGS = {"search_depth": 3, "method": 'minimax', "iterative": False}
-    CUSTOM_ARGS = {"method": 'alphabeta', 'iterative': True}
+    CUSTOM_ARGS = {"method": 'alphabeta', 'iterative': True, 'workers': WORKERS,
+                   'reductions': REDUCTIONS, 'extensions': EXTENSIONS}
+    if BOOK:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        'my-board'))
+        from opening_book import OpeningBook
+        CUSTOM_ARGS['book'] = OpeningBook.load(BOOK)
 
     def create_agent(args, heuristic):
         prefix = 'MM' if args['method'] == 'minimax' else 'AB'
@@ -198,6 +313,11 @@ def main(test_all=True):
 
     print(DESCRIPTION)
 
+    if WORKERS > 1:
+        depth_speedup(dict(CUSTOM_ARGS, score_fn=improved_score), WORKERS)
+
+    archive = GameRecordWriter(ARCHIVE) if ARCHIVE else None
+
     if test_all:
 
         for agentUT in test_agents:#[:0]:
@@ -207,7 +327,7 @@ def main(test_all=True):
             print("*************************")
     
             agents = random_agents + mm_agents + ab_agents + [agentUT]
-            win_ratio = play_round(agents, NUM_MATCHES)
+            win_ratio = play_round(agents, NUM_MATCHES, archive=archive)
     
             print("\n\nResults:")
             print("----------")
@@ -223,12 +343,17 @@ def main(test_all=True):
             print("*************************")
             print("{:^25}".format("Evaluating: " + agentUT.name + " against Student's custom heuristics"))
             print("*************************")
-            win_ratio = play_round(compete, NUM_MATCHES)
+            win_ratio = play_round(compete, NUM_MATCHES, archive=archive)
         
             print("\n\nResults:")
             print("----------")
             print("{!s:<18}{:>10.2f}%".format(agentUT.name, win_ratio))
-    
+
+    if archive is not None:
+        archive.close()
+    for agent in mm_agents + ab_agents + test_agents + custom_agents:
+        agent.player.close()
+
 
 if __name__ == "__main__":
     main()